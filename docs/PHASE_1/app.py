@@ -1,10 +1,16 @@
 import os
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 import xrpl
-import time
+import sys
+import signal
 import sqlite3
+import queue
+import atexit
 import requests
-from threading import Thread
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from threading import Thread, Lock, Event
+from xrpl.utils import ripple_time_to_datetime
 import logging
 from datetime import datetime
 from typing import Optional, Dict, List
@@ -14,6 +20,16 @@ app = Flask(__name__)
 testnet_url = "https://s.altnet.rippletest.net:51234"
 client = xrpl.clients.JsonRpcClient(testnet_url)
 DATABASE = 'transactions.db'
+shutdown_event = Event()
+
+# Shared HTTP session so rate fetches reuse the TLS connection to CoinMarketCap
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+http_session.headers.update({'Accepts': 'application/json'})
 
 # Configure logging
 logging.basicConfig(
@@ -22,26 +38,87 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class ConnectionPool:
+    """
+    Fixed-size pool of long-lived SQLite connections.
+    Reusing connections keeps SQLite's per-connection page cache warm and avoids
+    reopening the db/-wal/-shm files on every request.
+    """
+
+    def __init__(self, database, size=4):
+        self.database = database
+        self.size = size
+        self._idle = queue.Queue(maxsize=size)
+        self._connections = []
+        self._lock = Lock()
+        self._writer = None
+
+    def _connect(self):
+        # Long-lived connections keep their prepared INSERT/SELECT statements cached
+        conn = sqlite3.connect(self.database, check_same_thread=False, cached_statements=512)
+        # synchronous is a per-connection setting; NORMAL is safe under WAL
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-20000")
+        self._connections.append(conn)
+        return conn
+
+    def acquire(self):
+        """Take an idle connection, opening a new one while below the pool size."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._connections) - (self._writer is not None) < self.size:
+                return self._connect()
+        return self._idle.get()
+
+    def release(self, conn):
+        """Return a connection to the pool, discarding any uncommitted work."""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def writer(self):
+        """Dedicated connection for the monitor thread, kept out of the shared pool."""
+        with self._lock:
+            if self._writer is None:
+                self._writer = self._connect()
+        return self._writer
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._writer = None
+
+
+db_pool = ConnectionPool(DATABASE)
+atexit.register(db_pool.close_all)
+
 @contextmanager
 def get_db_connection():
     """
-    Context manager for database connections.
+    Context manager for pooled database connections.
     Yields:
         sqlite3.Connection: Database connection object
     """
-    conn = None
+    conn = db_pool.acquire()
     try:
-        conn = sqlite3.connect(DATABASE)
         yield conn
     finally:
-        if conn:
-            conn.close()
+        db_pool.release(conn)
 
 def init_db():
     """
     Initialize the SQLite database and create the transactions table if it does not exist.
     """
     with get_db_connection() as conn:
+        # WAL is persisted in the database file, so setting it once here is enough.
+        # It lets /transactions readers proceed while the monitor thread writes.
+        if DATABASE != ':memory:':
+            conn.execute("PRAGMA journal_mode=WAL")
         cursor = conn.cursor()
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS transactions (
@@ -53,58 +130,102 @@ def init_db():
                 timestamp TEXT
             )
         ''')
+        # tx_hash lookups already use the index implied by UNIQUE
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON transactions(timestamp DESC)')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
         conn.commit()
 
+def load_last_ledger_index(conn):
+    """
+    Load the highest ledger index whose transactions have all been stored.
+    Returns:
+        int: Ledger index, or 0 if nothing has been processed yet.
+    """
+    row = conn.execute(
+        "SELECT value FROM settings WHERE key = 'last_ledger_index'"
+    ).fetchone()
+    return int(row[0]) if row else 0
+
+def save_last_ledger_index(conn, ledger_index):
+    """
+    Persist the ledger cursor. Call inside the transaction that stored the rows.
+    """
+    conn.execute(
+        "INSERT OR REPLACE INTO settings (key, value) VALUES ('last_ledger_index', ?)",
+        (str(ledger_index),)
+    )
+
 def monitor_payments():
     """
     Monitor the XRPL account for new transactions and store them in the database.
-    Uses marker-based pagination to ensure no transactions are missed.
+    Only ledgers after the persisted cursor are requested, oldest first, using
+    marker-based pagination so no transactions are missed or re-scanned.
     """
+    conn = db_pool.writer()
+    last_ledger_index = load_last_ledger_index(conn)
     marker = None
-    while True:
+    while not shutdown_event.is_set():
         try:
             request = xrpl.models.requests.AccountTx(
                 account=merchant_address,
-                ledger_index="validated",
-                limit=100  # Process in smaller chunks
+                ledger_index_min=last_ledger_index + 1,
+                ledger_index_max=-1,
+                forward=True,
+                limit=200,
+                marker=marker
             )
-            if marker:
-                request.marker = marker
 
             response = client.request(request).result
             
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                for tx in response["transactions"]:
-                    tx_hash = tx['tx']['hash']
-                    cursor.execute("SELECT 1 FROM transactions WHERE tx_hash = ?", (tx_hash,))
-                    if not cursor.fetchone():
-                        try:
-                            amount = float(tx['meta']['delivered_amount']) / 1000000
-                            cursor.execute('''
-                                INSERT INTO transactions 
-                                (tx_hash, amount, fiat_amount, fiat_currency, timestamp)
-                                VALUES (?, ?, ?, ?, ?)
-                            ''', (
-                                tx_hash, 
-                                amount, 
-                                0, 
-                                "USD", 
-                                datetime.utcnow().isoformat()
-                            ))
-                            conn.commit()
-                            logger.info(f"New transaction processed: {tx_hash}")
-                        except KeyError as e:
-                            logger.error(f"Invalid transaction format: {e}")
-                            continue
+            received_at = datetime.utcnow().isoformat()
+            rows = []
+            max_ledger_index = last_ledger_index
+            for tx in response["transactions"]:
+                try:
+                    amount = float(tx['meta']['delivered_amount']) / 1000000
+                    # Prefer the ledger close time; it is stable across retries
+                    if 'date' in tx['tx']:
+                        timestamp = ripple_time_to_datetime(tx['tx']['date']).replace(tzinfo=None).isoformat()
+                    else:
+                        timestamp = received_at
+                    rows.append((tx['tx']['hash'], amount, 0, "USD", timestamp))
+                    max_ledger_index = max(max_ledger_index, tx['tx']['ledger_index'])
+                except KeyError as e:
+                    logger.error("Invalid transaction format: %s", e)
+                    continue
 
             marker = response.get("marker")
+
+            # One commit per page; the UNIQUE tx_hash index drops already-stored rows.
+            # Mid-scan, the newest ledger may continue on the next page, so the
+            # cursor only advances to the ledger before it.
+            changes_before = conn.total_changes
+            with conn:
+                conn.executemany('''
+                    INSERT OR IGNORE INTO transactions 
+                    (tx_hash, amount, fiat_amount, fiat_currency, timestamp)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', rows)
+                new_count = conn.total_changes - changes_before
+                if max_ledger_index > last_ledger_index:
+                    save_last_ledger_index(
+                        conn, max_ledger_index - 1 if marker else max_ledger_index
+                    )
+            if new_count:
+                logger.info("New transactions processed: %d", new_count)
+
             if not marker:
-                time.sleep(5)  # Only sleep when we've processed all available transactions
+                last_ledger_index = max_ledger_index
+                shutdown_event.wait(5)  # Only wait when we've processed all available transactions
 
         except Exception as e:
             logger.error(f"Error monitoring payments: {e}", exc_info=True)
-            time.sleep(10)  # Longer sleep on error to prevent rapid retries
+            shutdown_event.wait(10)  # Longer wait on error to prevent rapid retries
 
 def get_xrp_to_usd_rate() -> Optional[float]:
     """
@@ -119,13 +240,10 @@ def get_xrp_to_usd_rate() -> Optional[float]:
 
     url = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
     parameters = {'symbol': 'XRP', 'convert': 'USD'}
-    headers = {
-        'Accepts': 'application/json',
-        'X-CMC_PRO_API_KEY': api_key
-    }
+    headers = {'X-CMC_PRO_API_KEY': api_key}
     
     try:
-        response = requests.get(url, headers=headers, params=parameters, timeout=10)
+        response = http_session.get(url, headers=headers, params=parameters, timeout=10)
         response.raise_for_status()
         data = response.json()
         return data['data']['XRP']['quote']['USD']['price']
@@ -136,18 +254,46 @@ def get_xrp_to_usd_rate() -> Optional[float]:
         logger.error(f"Error parsing XRP rate response: {e}", exc_info=True)
         return None
 
+def stream_transactions(cursor):
+    """
+    Yield rows of pre-encoded JSON objects as a JSON array, one element at a time.
+    """
+    yield '['
+    separator = ''
+    for row in cursor:
+        yield separator + row[0]
+        separator = ','
+    yield ']'
+
 @app.route('/transactions')
 def get_transactions():
     """
     API endpoint to retrieve all transactions from the database.
+    Rows are streamed from the cursor instead of being loaded into one list.
     Returns:
         Response: JSON response containing a list of transactions.
     """
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM transactions")
-        transactions = cursor.fetchall()
-    return jsonify([{'tx_hash': row[1], 'amount': row[2], 'fiat_amount': row[3], 'currency': row[4]} for row in transactions])
+    conn = db_pool.acquire()
+    try:
+        # SQLite encodes each row itself, so no per-row dict or json.dumps is needed
+        cursor = conn.execute('''
+            SELECT json_object(
+                'tx_hash', tx_hash, 'amount', amount,
+                'fiat_amount', fiat_amount, 'currency', fiat_currency
+            )
+            FROM transactions
+        ''')
+    except sqlite3.Error:
+        db_pool.release(conn)
+        raise
+
+    def close():
+        cursor.close()
+        db_pool.release(conn)
+
+    response = Response(stream_transactions(cursor), mimetype='application/json')
+    response.call_on_close(close)
+    return response
 
 @app.route('/xrp_rate')
 def get_xrp_rate():
@@ -162,7 +308,21 @@ def get_xrp_rate():
     else:
         return jsonify({'error': 'Could not fetch XRP rate'}), 500
 
+def cleanup():
+    """
+    Stop the payment monitor before shutdown.
+    """
+    shutdown_event.set()
+    logger.info("Shutting down payment monitor...")
+
 if __name__ == '__main__':
+    # Turn SIGTERM into SystemExit so the finally block runs
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    init_db()
     payment_monitor = Thread(target=monitor_payments, daemon=True)
     payment_monitor.start()
-    app.run(debug=True)
+    try:
+        # The debug reloader re-imports the module and would start a second monitor
+        app.run(debug=os.environ.get('FLASK_DEBUG') == '1', use_reloader=False)
+    finally:
+        cleanup()
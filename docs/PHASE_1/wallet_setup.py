@@ -8,9 +8,10 @@ private keys directly.
 
 import os
 import logging
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 from pathlib import Path
 import hashlib
+import hmac
 from xrpl.wallet import generate_faucet_wallet
 from xrpl.clients import JsonRpcClient
 from xrpl.wallet import Wallet
@@ -51,17 +52,19 @@ def validate_testnet_url(url: str) -> bool:
         logger.error(f"Failed to validate testnet URL: {e}")
         return False
 
-def secure_hash(data: str) -> str:
+def secure_hash(data: Union[str, bytes]) -> str:
     """
     Create a secure hash of the provided data using SHA-256.
 
     Args:
-        data (str): The data to hash.
+        data (Union[str, bytes]): The data to hash. Bytes are hashed as-is.
 
     Returns:
         str: The hexadecimal representation of the hash.
     """
-    return hashlib.sha256(data.encode()).hexdigest()
+    if isinstance(data, str):
+        data = data.encode()
+    return hashlib.sha256(data).hexdigest()
 
 def generate_and_store_wallet(
     testnet_url: str = "https://s.altnet.rippletest.net:51234",
@@ -122,6 +125,7 @@ def generate_and_store_wallet(
 def verify_wallet_hash(seed: str, stored_hash: str) -> bool:
     """
     Verify a wallet seed against a stored hash.
+    Uses a constant-time comparison so the check does not leak timing information.
 
     Args:
         seed (str): The wallet seed to verify.
@@ -130,7 +134,7 @@ def verify_wallet_hash(seed: str, stored_hash: str) -> bool:
     Returns:
         bool: True if the hash matches, False otherwise.
     """
-    return secure_hash(seed) == stored_hash
+    return hmac.compare_digest(secure_hash(seed), stored_hash)
 
 if __name__ == "__main__":
     try:
@@ -7,32 +7,46 @@ It provides REST endpoints for retrieving transaction data and current exchange
 """
 
 import os
-from typing import Optional, Dict, Any, List
+import sys
+import signal
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple, Iterable, Iterator
 from datetime import datetime
 import logging.handlers
 from pathlib import Path
 from decimal import Decimal
 import sqlite3
+import queue
+import atexit
 from contextlib import contextmanager
-from threading import Thread, Event
+from threading import Thread, Event, Lock
 
 import xrpl
-from xrpl.clients import JsonRpcClient
-from xrpl.models.requests import AccountTx
+from xrpl.clients import JsonRpcClient, WebsocketClient
+from xrpl.models.requests import AccountTx, Subscribe
+from xrpl.utils import ripple_time_to_datetime
 from flask import Flask, jsonify, Response
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
 
 # Application Configuration
 class Config:
     """Application configuration settings."""
     TESTNET_URL: str = "https://s.altnet.rippletest.net:51234"
+    TESTNET_WS_URL: str = "wss://s.altnet.rippletest.net:51233"
     DATABASE: Path = Path("data/payments.db")
     LOG_FILE: Path = Path("logs/fleXRP.log")
-    MIN_XRP_AMOUNT: Decimal = Decimal("0.0001")
+    MIN_DROPS: int = 100  # 0.0001 XRP
+    DROPS_PER_XRP: Decimal = Decimal(1_000_000)
     REQUEST_TIMEOUT: int = 30
     RATE_LIMIT_RETRIES: int = 3
     POLLING_INTERVAL: int = 5
+    MAX_RECONNECT_DELAY: int = 60
+    RATE_REFRESH_INTERVAL: int = 60
+    PROCESSED_CACHE_SIZE: int = 10_000
+    DB_POOL_SIZE: int = 4
 
 # Ensure required directories exist
 Config.DATABASE.parent.mkdir(parents=True, exist_ok=True)
@@ -66,29 +80,119 @@ if missing_vars:
 merchant_address: str = os.environ["MERCHANT_ADDRESS"]
 coinmarketcap_api_key: str = os.environ["COINMARKETCAP_API_KEY"]
 
+# Shared HTTP session so rate fetches reuse the TLS connection to CoinMarketCap
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=Config.RATE_LIMIT_RETRIES,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+))
+http_session.headers.update({
+    'Accepts': 'application/json',
+    'X-CMC_PRO_API_KEY': coinmarketcap_api_key
+})
+
+# (tx_hash, sender, receiver, xrp_amount, usd_amount, timestamp)
+PaymentRow = Tuple[str, str, str, Decimal, Decimal, str]
+
+# sqlite3 cannot bind Decimal parameters; store amounts by their exact text
+sqlite3.register_adapter(Decimal, str)
+
 # Thread control
 shutdown_event = Event()
 
+# Most recent XRP/USD rate, kept fresh by refresh_xrp_to_usd_rate()
+_rate_cache: Dict[str, Optional[Decimal]] = {"value": None}
+_rate_lock = Lock()
+
+class ConnectionPool:
+    """
+    Fixed-size pool of long-lived SQLite connections.
+
+    Reusing connections keeps SQLite's per-connection page cache warm and avoids
+    reopening the db/-wal/-shm files on every request. The monitor thread gets
+    its own writer connection so it never waits on request handlers.
+    """
+
+    def __init__(self, database: Path, size: int) -> None:
+        self.database = database
+        self.size = size
+        self._idle: queue.Queue = queue.Queue(maxsize=size)
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Long-lived connections keep their prepared INSERT/SELECT statements cached
+        conn = sqlite3.connect(self.database, check_same_thread=False, cached_statements=512)
+        conn.row_factory = sqlite3.Row
+        # synchronous is a per-connection setting; NORMAL is safe under WAL
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        self._connections.append(conn)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, opening a new one while below the pool size."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._connections) - (self._writer is not None) < self.size:
+                return self._connect()
+        return self._idle.get()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, discarding any uncommitted work."""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def writer(self) -> sqlite3.Connection:
+        """Dedicated connection for the monitor thread, kept out of the shared pool."""
+        with self._lock:
+            if self._writer is None:
+                self._writer = self._connect()
+        return self._writer
+
+    def close_all(self) -> None:
+        """Close every connection opened by the pool."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._writer = None
+
+db_pool = ConnectionPool(Config.DATABASE, Config.DB_POOL_SIZE)
+atexit.register(db_pool.close_all)
+
 @contextmanager
 def get_db_connection():
     """
-    Context manager for database connections.
+    Context manager for pooled database connections.
     
     Yields:
         sqlite3.Connection: Database connection object
     """
-    conn = None
+    conn = db_pool.acquire()
     try:
-        conn = sqlite3.connect(Config.DATABASE)
-        conn.row_factory = sqlite3.Row
         yield conn
     finally:
-        if conn:
-            conn.close()
+        db_pool.release(conn)
 
 def init_db() -> None:
     """Initialize the SQLite database with required tables."""
     with get_db_connection() as conn:
+        # WAL is persisted in the database file, so setting it once here is enough.
+        # It lets /transactions readers proceed while the monitor thread writes.
+        if str(Config.DATABASE) != ':memory:':
+            conn.execute("PRAGMA journal_mode=WAL")
         conn.execute('''
             CREATE TABLE IF NOT EXISTS payments (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -101,70 +205,124 @@ def init_db() -> None:
                 status TEXT DEFAULT 'pending'
             )
         ''')
+        # tx_hash lookups already use the index implied by UNIQUE
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON payments(timestamp DESC)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
         conn.commit()
 
-def is_valid_payment(transaction: Dict[str, Any], merchant_addr: str) -> bool:
+def load_last_ledger_index() -> int:
+    """
+    Load the highest ledger index whose transactions have all been stored.
+
+    Returns:
+        int: Ledger index, or 0 if nothing has been processed yet
+    """
+    row = db_pool.writer().execute(
+        "SELECT value FROM settings WHERE key = 'last_ledger_index'"
+    ).fetchone()
+    return int(row['value']) if row else 0
+
+def get_payment_drops(transaction: Dict[str, Any], merchant_addr: str) -> Optional[int]:
     """
-    Validate if a transaction is a valid payment.
+    Validate a payment and return its amount in drops.
 
     Args:
         transaction: Transaction data from XRPL
         merchant_addr: Merchant's XRPL address
 
     Returns:
-        bool: True if payment is valid, False otherwise
+        Optional[int]: Amount in drops if payment is valid, None otherwise
     """
+    tx_data = transaction.get('tx') or {}
+    if (tx_data.get('TransactionType') != 'Payment' or
+            tx_data.get('Destination') != merchant_addr):
+        return None
+    
+    delivered_amount = (transaction.get('meta') or {}).get('delivered_amount')
+    if not isinstance(delivered_amount, (str, int)):
+        # Issued-currency amounts are objects; only XRP (drops) is accepted
+        return None
+    
     try:
-        if (transaction['tx'].get('TransactionType') != 'Payment' or
-            transaction['tx'].get('Destination') != merchant_addr):
-            return False
-        
-        amount = Decimal(str(transaction['meta']['delivered_amount'])) / Decimal("1000000")
-        return amount >= Config.MIN_XRP_AMOUNT
-    except (KeyError, TypeError, ValueError) as e:
-        logger.warning(f"Invalid transaction format: {e}", exc_info=True)
-        return False
+        drops = int(delivered_amount)
+    except ValueError:
+        logger.warning("Invalid transaction format: delivered_amount=%r", delivered_amount)
+        return None
+    return drops if drops >= Config.MIN_DROPS else None
 
-def store_transaction(
-    tx_hash: str,
-    sender: str,
-    receiver: str,
-    xrp_amount: Decimal,
-    usd_amount: Decimal
+def store_transactions(
+    payments: List[PaymentRow],
+    last_ledger_index: Optional[int] = None
 ) -> bool:
     """
-    Store transaction details in the database.
+    Store a batch of transactions in the database within a single commit.
 
     Args:
-        tx_hash: Transaction hash
-        sender: Sender's address
-        receiver: Receiver's address
-        xrp_amount: Amount in XRP
-        usd_amount: Amount in USD
+        payments: (tx_hash, sender, receiver, xrp_amount, usd_amount, timestamp) tuples
+        last_ledger_index: Ledger cursor to persist in the same commit, if any
 
     Returns:
-        bool: True if storage successful, False otherwise
+        bool: True if the batch is stored (already-stored duplicates are
+        ignored), False otherwise
     """
+    if not payments and last_ledger_index is None:
+        return True
+
     try:
-        with get_db_connection() as conn:
-            conn.execute('''
-                INSERT INTO payments (
+        conn = db_pool.writer()
+        changes_before = conn.total_changes
+        with conn:
+            conn.executemany('''
+                INSERT OR IGNORE INTO payments (
                     tx_hash, sender, receiver, amount_xrp,
                     amount_usd, timestamp, status
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                tx_hash, sender, receiver, xrp_amount,
-                usd_amount, datetime.utcnow().isoformat(),
-                'confirmed'
-            ))
-            conn.commit()
+                VALUES (?, ?, ?, ?, ?, ?, 'confirmed')
+            ''', payments)
+            stored = conn.total_changes - changes_before
+            if last_ledger_index is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO settings (key, value) VALUES ('last_ledger_index', ?)",
+                    (str(last_ledger_index),)
+                )
+        logger.debug("Stored %d of %d transactions", stored, len(payments))
         return True
     except sqlite3.Error as e:
-        logger.error(f"Database error storing transaction {tx_hash}: {e}", exc_info=True)
+        logger.error(f"Database error storing {len(payments)} transactions: {e}", exc_info=True)
         return False
 
 def get_xrp_to_usd_rate() -> Optional[Decimal]:
+    """
+    Get the latest XRP to USD exchange rate.
+
+    Reads the value kept fresh by the refresher thread. Only a call made before
+    any rate has been fetched waits on CoinMarketCap.
+
+    Returns:
+        Optional[Decimal]: Exchange rate or None if fetch fails
+    """
+    rate = _rate_cache["value"]
+    if rate is None:
+        with _rate_lock:
+            if _rate_cache["value"] is None:
+                _rate_cache["value"] = _fetch_xrp_to_usd_rate()
+            rate = _rate_cache["value"]
+    return rate
+
+def refresh_xrp_to_usd_rate() -> None:
+    """Refresh the cached rate every Config.RATE_REFRESH_INTERVAL until shutdown."""
+    while not shutdown_event.is_set():
+        rate = _fetch_xrp_to_usd_rate()
+        if rate is not None:
+            _rate_cache["value"] = rate
+        shutdown_event.wait(Config.RATE_REFRESH_INTERVAL)
+
+def _fetch_xrp_to_usd_rate() -> Optional[Decimal]:
     """
     Fetch current XRP to USD exchange rate from CoinMarketCap.
 
@@ -173,80 +331,231 @@ def get_xrp_to_usd_rate() -> Optional[Decimal]:
     """
     url = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
     params = {'symbol': 'XRP', 'convert': 'USD'}
-    headers = {
-        'Accepts': 'application/json',
-        'X-CMC_PRO_API_KEY': coinmarketcap_api_key
-    }
     
     try:
-        response = requests.get(
+        response = http_session.get(
             url,
-            headers=headers,
             params=params,
             timeout=Config.REQUEST_TIMEOUT
         )
         response.raise_for_status()
-        data = response.json()
-        return Decimal(str(data['data']['XRP']['quote']['USD']['price']))
+        # Parse prices straight to Decimal instead of float -> str -> Decimal
+        data = response.json(parse_float=Decimal)
+        return Decimal(data['data']['XRP']['quote']['USD']['price'])
     except (RequestException, KeyError, ValueError) as e:
         logger.error(f"Error fetching XRP rate: {e}", exc_info=True)
         return None
 
+def ledger_timestamp(tx_data: Dict[str, Any], fallback: str) -> str:
+    """
+    Get the close time of the ledger that included a transaction.
+
+    Args:
+        tx_data: Transaction fields, with 'date' in seconds since the Ripple epoch
+        fallback: Timestamp to use when the transaction carries no date
+
+    Returns:
+        str: Naive UTC ISO timestamp, matching datetime.utcnow().isoformat()
+    """
+    date = tx_data.get('date')
+    if date is None:
+        return fallback
+    return ripple_time_to_datetime(date).replace(tzinfo=None).isoformat()
+
+def _collect_payments(
+    transactions: List[Dict[str, Any]],
+    processed_transactions: OrderedDict
+) -> List[PaymentRow]:
+    """
+    Build rows for the valid, not yet processed payments in a transaction list.
+
+    Args:
+        transactions: Transactions in AccountTx shape ({'tx': ..., 'meta': ...})
+        processed_transactions: LRU of recently stored hashes
+
+    Returns:
+        List of rows ready for store_transactions
+    """
+    pending = []
+    received_at = datetime.utcnow().isoformat()
+    for tx in transactions:
+        tx_hash = tx['tx']['hash']
+        if tx_hash in processed_transactions:
+            processed_transactions.move_to_end(tx_hash)
+            continue
+        
+        drops = get_payment_drops(tx, merchant_address)
+        if drops is None:
+            continue
+        
+        xrp_amount = Decimal(drops) / Config.DROPS_PER_XRP
+        usd_amount = Decimal("0")
+        rate = get_xrp_to_usd_rate()
+        if rate:
+            usd_amount = xrp_amount * rate
+        
+        pending.append((
+            tx_hash,
+            tx['tx']['Account'],
+            merchant_address,
+            xrp_amount,
+            usd_amount,
+            ledger_timestamp(tx['tx'], received_at)
+        ))
+    return pending
+
+def _store_payments(
+    pending: List[PaymentRow],
+    processed_transactions: OrderedDict,
+    last_ledger_index: Optional[int]
+) -> None:
+    """
+    Store collected payments and remember their hashes.
+
+    Raises:
+        sqlite3.Error: If the batch could not be stored
+    """
+    if not store_transactions(pending, last_ledger_index):
+        raise sqlite3.Error(f"Failed to store {len(pending)} transactions")
+    for payment in pending:
+        processed_transactions[payment[0]] = None
+        logger.info("Processed transaction: %s", payment[0])
+    while len(processed_transactions) > Config.PROCESSED_CACHE_SIZE:
+        processed_transactions.popitem(last=False)
+
+def backfill_payments(last_ledger_index: int, processed_transactions: OrderedDict) -> int:
+    """
+    Store every payment in ledgers after the cursor, oldest first.
+
+    Pages are followed by marker so account history is never re-scanned.
+
+    Args:
+        last_ledger_index: Highest ledger already fully stored
+        processed_transactions: LRU of recently stored hashes
+
+    Returns:
+        int: The new cursor
+    """
+    marker = None
+    while True:
+        response = client.request(AccountTx(
+            account=merchant_address,
+            ledger_index_min=last_ledger_index + 1,
+            ledger_index_max=-1,
+            forward=True,
+            limit=200,
+            marker=marker
+        )).result
+        
+        max_ledger_index = last_ledger_index
+        for tx in response['transactions']:
+            max_ledger_index = max(max_ledger_index, tx['tx'].get('ledger_index', 0))
+        
+        marker = response.get('marker')
+        # Mid-scan, the newest ledger may continue on the next page
+        cursor = None
+        if max_ledger_index > last_ledger_index:
+            cursor = max_ledger_index - 1 if marker else max_ledger_index
+        
+        _store_payments(
+            _collect_payments(response['transactions'], processed_transactions),
+            processed_transactions,
+            cursor
+        )
+        
+        if not marker:
+            return max_ledger_index
+
 def monitor_payments() -> None:
-    """Monitor XRPL for incoming payments to merchant address."""
-    processed_transactions = set()
+    """
+    Monitor XRPL for incoming payments to merchant address.
+
+    Missed ledgers are backfilled over JSON-RPC, then the account is followed
+    through a WebSocket subscription so new payments are pushed as they
+    validate. Dropped connections are retried with exponential backoff.
+    """
+    # Recently stored hashes, bounded LRU; the UNIQUE tx_hash column is the real dedupe
+    processed_transactions: OrderedDict = OrderedDict()
+    last_ledger_index = load_last_ledger_index()
+    retry_delay = Config.POLLING_INTERVAL
     
     while not shutdown_event.is_set():
         try:
-            response = client.request(AccountTx(
-                account=merchant_address,
-                ledger_index="validated"
-            )).result
-            
-            for tx in response['transactions']:
-                tx_hash = tx['tx']['hash']
-                if tx_hash not in processed_transactions:
-                    if is_valid_payment(tx, merchant_address):
-                        xrp_amount = Decimal(str(tx['meta']['delivered_amount'])) / Decimal("1000000")
-                        usd_amount = Decimal("0")
-                        
-                        rate = get_xrp_to_usd_rate()
-                        if rate:
-                            usd_amount = xrp_amount * rate
-                        
-                        if store_transaction(
-                            tx_hash,
-                            tx['tx']['Account'],
-                            merchant_address,
-                            xrp_amount,
-                            usd_amount
-                        ):
-                            processed_transactions.add(tx_hash)
-                            logger.info(f"Processed transaction: {tx_hash}")
-            
-            shutdown_event.wait(Config.POLLING_INTERVAL)
+            with WebsocketClient(Config.TESTNET_WS_URL) as ws:
+                # Subscribe before backfilling so nothing validated in between is
+                # missed; stream messages queue up until the backfill completes.
+                ws.send(Subscribe(accounts=[merchant_address]))
+                last_ledger_index = backfill_payments(last_ledger_index, processed_transactions)
+                retry_delay = Config.POLLING_INTERVAL
+                
+                for message in ws:
+                    if shutdown_event.is_set():
+                        break
+                    if message.get('type') != 'transaction' or not message.get('validated'):
+                        continue
+                    
+                    ledger_index = message['ledger_index']
+                    tx = {
+                        'tx': {**message['transaction'], 'ledger_index': ledger_index},
+                        'meta': message['meta']
+                    }
+                    # Other transactions from this ledger may still be on the way
+                    last_ledger_index = max(last_ledger_index, ledger_index - 1)
+                    _store_payments(
+                        _collect_payments([tx], processed_transactions),
+                        processed_transactions,
+                        last_ledger_index
+                    )
             
         except Exception as e:
             logger.error("Error in payment monitoring:", exc_info=True)
-            shutdown_event.wait(Config.POLLING_INTERVAL * 2)
+            shutdown_event.wait(retry_delay)
+            retry_delay = min(retry_delay * 2, Config.MAX_RECONNECT_DELAY)
+
+def _stream_json_array(rows: Iterable[sqlite3.Row]) -> Iterator[str]:
+    """Yield single-column rows of pre-encoded JSON objects as a JSON array."""
+    yield '['
+    separator = ''
+    for row in rows:
+        yield separator + row[0]
+        separator = ','
+    yield ']'
 
 @app.route('/transactions')
 def get_transactions() -> Response:
     """
     API endpoint to retrieve all transactions.
 
+    Rows are streamed straight from the SQLite cursor, so memory use and time
+    to first byte do not grow with the table. The pooled connection is
+    returned once the response is closed.
+
     Returns:
         Response: JSON response containing transaction list
     """
+    conn = db_pool.acquire()
     try:
-        with get_db_connection() as conn:
-            cursor = conn.execute("SELECT * FROM payments ORDER BY timestamp DESC")
-            transactions = cursor.fetchall()
-        
-        return jsonify([dict(tx) for tx in transactions])
+        # SQLite encodes each row itself, so no per-row dict or json.dumps is needed
+        cursor = conn.execute('''
+            SELECT json_object(
+                'id', id, 'tx_hash', tx_hash, 'sender', sender,
+                'receiver', receiver, 'amount_xrp', amount_xrp,
+                'amount_usd', amount_usd, 'timestamp', timestamp, 'status', status
+            )
+            FROM payments ORDER BY timestamp DESC
+        ''')
     except Exception as e:
+        db_pool.release(conn)
         logger.error("Error retrieving transactions:", exc_info=True)
         return jsonify({'error': 'Internal server error'}), 500
+    
+    def close() -> None:
+        cursor.close()
+        db_pool.release(conn)
+    
+    response = Response(_stream_json_array(cursor), mimetype='application/json')
+    response.call_on_close(close)
+    return response
 
 @app.route('/xrp_rate')
 def get_xrp_rate() -> Response:
@@ -261,15 +570,28 @@ def get_xrp_rate() -> Response:
         return jsonify({'rate': float(rate)})
     return jsonify({'error': 'Could not fetch XRP rate'}), 500
 
+def start_background_services() -> None:
+    """
+    Initialize the database and start the rate refresher and payment monitor.
+
+    Called once per process, either from __main__ or from wsgi.py.
+    """
+    init_db()
+    rate_refresher = Thread(target=refresh_xrp_to_usd_rate, daemon=True)
+    rate_refresher.start()
+    payment_monitor = Thread(target=monitor_payments, daemon=True)
+    payment_monitor.start()
+
 def cleanup() -> None:
     """Cleanup resources before shutdown."""
     shutdown_event.set()
     logger.info("Shutting down payment monitor...")
 
 if __name__ == '__main__':
-    init_db()
-    payment_monitor = Thread(target=monitor_payments, daemon=True)
-    payment_monitor.start()
+    # Development server only; see wsgi.py for running under gunicorn
+    # Turn SIGTERM into SystemExit so the finally block runs
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    start_background_services()
     
     try:
         app.run(host='0.0.0.0', port=5000)
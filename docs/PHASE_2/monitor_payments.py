@@ -10,10 +10,11 @@ Dependencies:
     - xrpl-py: For XRPL network interaction
     - sqlite3: For persistent storage
     - requests: For external API calls
+    - httpx: For persistent JSON-RPC connections (installed with xrpl-py)
 """
 
 import os
-from typing import Optional, Dict, Any, Set
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 import logging
 from logging.handlers import RotatingFileHandler
@@ -21,23 +22,42 @@ from pathlib import Path
 from decimal import Decimal
 import sqlite3
 from contextlib import contextmanager
+import asyncio
+import random
 import time
-from threading import Event
+from json import JSONDecodeError
+from threading import Event, Lock
 
+import httpx
+import requests
 import xrpl
-from xrpl.clients import JsonRpcClient, XRPLRequestError
-from xrpl.models.requests import AccountTx
+from xrpl.asyncio.clients import AsyncJsonRpcClient, AsyncWebsocketClient
+from xrpl.asyncio.clients.exceptions import XRPLRequestFailureException
+from xrpl.asyncio.clients.utils import json_to_response, request_to_json_rpc
+from xrpl.models.requests import AccountTx, Subscribe
+from xrpl.models.requests.request import Request
+from xrpl.models.response import Response
 
 # Configuration
 class Config:
     """Application configuration and constants."""
     
+    XRPL_NODE_URL: str = os.getenv('XRPL_NODE_URL', 'https://s.altnet.rippletest.net:51234')
+    XRPL_WS_URL: str = os.getenv('XRPL_WS_URL', 'wss://s.altnet.rippletest.net:51233')
     DATABASE: Path = Path('data/payments.db')
     LOG_FILE: Path = Path('logs/fleXRP.log')
-    MIN_XRP_AMOUNT: Decimal = Decimal('0.0001')
-    POLLING_INTERVAL: int = 5
-    RETRY_DELAY: int = 10
+    MIN_DROPS: int = 100  # 0.0001 XRP
+    INITIAL_RETRY_DELAY: float = 0.5  # seconds; doubled on each consecutive failure
+    MAX_RETRY_DELAY: float = 10.0
+    # rippled errors that retrying cannot fix
+    PERMANENT_XRPL_ERRORS: frozenset = frozenset({
+        'actMalformed', 'invalidParams', 'unknownCmd', 'noPermission'
+    })
     MAX_RETRIES: int = 3
+    BUSY_TIMEOUT: float = 5.0  # seconds to wait on a locked database
+    REQUEST_TIMEOUT: int = 10
+    RATE_CACHE_TTL: float = 30.0  # seconds a fetched XRP/USD rate is reused
+    COINMARKETCAP_API_KEY: str = os.getenv('COINMARKETCAP_API_KEY', '')
     
     # Ensure required directories exist
     DATABASE.parent.mkdir(parents=True, exist_ok=True)
@@ -59,10 +79,66 @@ logger.addHandler(handler)
 # Global shutdown event for graceful termination
 shutdown_event = Event()
 
+# WAL is persisted in the database file, so it only needs enabling once per process
+_wal_enabled = False
+
+# Kept as one constant so every insert hits the connection's statement cache.
+# The UNIQUE tx_hash index drops payments that were already stored.
+INSERT_SQL = '''
+    INSERT OR IGNORE INTO payments (
+        tx_hash, sender, receiver, amount_xrp,
+        amount_usd, timestamp, ts_unix, status
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, 'confirmed')
+'''
+
+# Same settings row app.py keeps its ledger cursor in, so both see progress
+SAVE_LEDGER_INDEX_SQL = '''
+    INSERT INTO settings (key, value) VALUES ('last_ledger_index', ?)
+    ON CONFLICT(key) DO UPDATE SET value = excluded.value
+'''
+
+# Last fetched XRP/USD rate and the time.monotonic() it was fetched at
+_rate_cache: Tuple[Optional[Decimal], float] = (None, 0.0)
+
+# Long-lived connection used by the monitor for all writes
+_writer_conn: Optional[sqlite3.Connection] = None
+_writer_lock = Lock()
+
+def _connect() -> sqlite3.Connection:
+    """
+    Open a database connection with the performance PRAGMAs applied.
+    
+    Returns:
+        sqlite3.Connection: Database connection object
+    
+    Raises:
+        sqlite3.Error: If database connection fails
+    """
+    global _wal_enabled
+    # IMMEDIATE takes the write lock up front instead of failing mid-transaction
+    conn = sqlite3.connect(
+        Config.DATABASE,
+        isolation_level="IMMEDIATE",
+        timeout=Config.BUSY_TIMEOUT,
+        check_same_thread=False,
+        cached_statements=256
+    )
+    conn.row_factory = sqlite3.Row
+    if not _wal_enabled:
+        conn.execute("PRAGMA journal_mode=WAL")
+        _wal_enabled = True
+    # Per-connection settings; synchronous=NORMAL is durable enough under WAL
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
 @contextmanager
 def get_db_connection():
     """
-    Context manager for database connections.
+    Context manager for short-lived database connections.
     
     Yields:
         sqlite3.Connection: Database connection object
@@ -72,25 +148,52 @@ def get_db_connection():
     """
     conn = None
     try:
-        conn = sqlite3.connect(Config.DATABASE)
-        conn.row_factory = sqlite3.Row
+        conn = _connect()
         yield conn
     finally:
         if conn:
             conn.close()
 
-def init_db() -> None:
+def get_writer_connection() -> sqlite3.Connection:
+    """
+    Get the monitor's long-lived writer connection, opening it on first use.
+    
+    Reusing one connection keeps the schema, page cache and prepared
+    statements warm across inserts. Hold _writer_lock while writing.
+    
+    Returns:
+        sqlite3.Connection: Writer connection
+    """
+    global _writer_conn
+    with _writer_lock:
+        if _writer_conn is None:
+            _writer_conn = _connect()
+    return _writer_conn
+
+def close_writer_connection() -> None:
+    """Close the writer connection if it is open."""
+    global _writer_conn
+    with _writer_lock:
+        if _writer_conn is not None:
+            _writer_conn.close()
+            _writer_conn = None
+
+def init_db(conn: Optional[sqlite3.Connection] = None) -> None:
     """
     Initialize the SQLite database with required tables and indices.
     
     Creates the payments table if it doesn't exist and sets up necessary indices
     for optimal query performance.
     
+    Args:
+        conn: Connection to use; defaults to the writer connection
+    
     Raises:
         sqlite3.Error: If database initialization fails
     """
+    conn = conn or get_writer_connection()
     try:
-        with get_db_connection() as conn:
+        with _writer_lock:
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS payments (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -100,18 +203,54 @@ def init_db() -> None:
                     amount_xrp DECIMAL(20, 6),
                     amount_usd DECIMAL(20, 2),
                     timestamp TEXT,
+                    ts_unix INTEGER,
                     status TEXT DEFAULT 'pending'
                 )
             ''')
-            # Create indices for frequent queries
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_tx_hash ON payments(tx_hash)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON payments(timestamp)')
+            # The table is shared with app.py, which reads and sorts by the
+            # ISO timestamp; ts_unix sits beside it for integer range queries.
+            # Tables created by app.py or before ts_unix only have timestamp.
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(payments)')}
+            if 'ts_unix' not in columns:
+                conn.execute('ALTER TABLE payments ADD COLUMN ts_unix INTEGER')
+                conn.execute('''
+                    UPDATE payments
+                    SET ts_unix = CAST(strftime('%s', timestamp) AS INTEGER)
+                ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS settings (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+            # tx_hash is already indexed by its UNIQUE constraint
+            conn.execute('DROP INDEX IF EXISTS idx_tx_hash')
+            # Same definition as app.py's, whichever process creates it first
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON payments(timestamp DESC)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_ts_unix ON payments(ts_unix)')
             conn.commit()
     except sqlite3.Error as e:
         logger.error("Database initialization failed", exc_info=True)
         raise
 
-def is_valid_payment(transaction: Dict[str, Any], merchant_address: str) -> bool:
+def load_last_ledger_index(conn: Optional[sqlite3.Connection] = None) -> int:
+    """
+    Load the highest ledger index already scanned for payments.
+    
+    Args:
+        conn: Connection to use; defaults to the writer connection
+    
+    Returns:
+        int: Last scanned ledger index, 0 if nothing has been scanned yet
+    """
+    conn = conn or get_writer_connection()
+    with _writer_lock:
+        row = conn.execute(
+            "SELECT value FROM settings WHERE key = 'last_ledger_index'"
+        ).fetchone()
+    return int(row['value']) if row else 0
+
+def validate_payment(transaction: Dict[str, Any], merchant_address: str) -> Optional[int]:
     """
     Validate if a transaction is a valid payment to the merchant.
     
@@ -120,30 +259,40 @@ def is_valid_payment(transaction: Dict[str, Any], merchant_address: str) -> bool
         merchant_address: Merchant's XRPL address
     
     Returns:
-        bool: True if payment is valid, False otherwise
+        Optional[int]: Delivered amount in drops, None if payment is invalid
     """
+    tx_data = transaction.get('tx')
+    meta = transaction.get('meta')
+    if tx_data is None or meta is None:
+        return None
+    
+    if (tx_data.get('TransactionType') != 'Payment' or
+        tx_data.get('Destination') != merchant_address):
+        return None
+    
     try:
-        if not all(k in transaction for k in ['tx', 'meta']):
-            return False
-            
-        tx_data = transaction['tx']
-        if (tx_data.get('TransactionType') != 'Payment' or
-            tx_data.get('Destination') != merchant_address):
-            return False
-        
-        amount = Decimal(str(transaction['meta']['delivered_amount'])) / Decimal('1000000')
-        return amount >= Config.MIN_XRP_AMOUNT
-        
+        # XRP amounts are integer drops; issued currencies are dicts and fail here
+        drops = int(meta['delivered_amount'])
     except (KeyError, TypeError, ValueError) as e:
-        logger.warning(f"Invalid transaction format: {e}", exc_info=True)
-        return False
+        # Expected while scanning an account's history; no traceback needed
+        logger.debug("Invalid transaction format: %s", e)
+        return None
+    return drops if drops >= Config.MIN_DROPS else None
+
+def _now_timestamps() -> Tuple[str, int]:
+    """
+    Return the current time as app.py's naive UTC ISO text and as Unix seconds.
+    """
+    ts_unix = int(time.time())
+    return datetime.utcfromtimestamp(ts_unix).isoformat(), ts_unix
 
 def store_transaction(
     tx_hash: str,
     sender: str,
     receiver: str,
     xrp_amount: Decimal,
-    usd_amount: Decimal
+    usd_amount: Decimal,
+    conn: Optional[sqlite3.Connection] = None
 ) -> bool:
     """
     Store transaction data in the database.
@@ -154,104 +303,325 @@ def store_transaction(
         receiver: Receiver's address
         xrp_amount: Amount in XRP
         usd_amount: Amount in USD
+        conn: Connection to use; defaults to the writer connection
     
     Returns:
         bool: True if storage successful, False otherwise
     """
     try:
-        with get_db_connection() as conn:
-            conn.execute('''
-                INSERT INTO payments (
-                    tx_hash, sender, receiver, amount_xrp,
-                    amount_usd, timestamp, status
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        conn = conn or get_writer_connection()
+        timestamp, ts_unix = _now_timestamps()
+        with _writer_lock, conn:
+            # sqlite3 has no Decimal adapter; bind the exact text instead
+            conn.execute(INSERT_SQL, (
                 tx_hash,
                 sender,
                 receiver,
-                xrp_amount,
-                usd_amount,
-                datetime.utcnow().isoformat(),
-                'confirmed'
+                str(xrp_amount),
+                str(usd_amount),
+                timestamp,
+                ts_unix
             ))
-            conn.commit()
         return True
     except sqlite3.Error as e:
-        logger.error(f"Database error storing transaction {tx_hash}: {e}", exc_info=True)
+        logger.error("Database error storing transaction %s: %s", tx_hash, e, exc_info=True)
         return False
 
-def convert_xrp_to_usd(xrp_amount: Decimal) -> Decimal:
+def store_transactions(
+    payments: List[Tuple[str, str, str, Decimal, Decimal]],
+    last_ledger_index: Optional[int] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> int:
     """
-    Convert XRP amount to USD using current exchange rate.
+    Store a batch of transactions in a single database transaction.
+    
+    Transactions that are already stored are skipped by the database. If
+    the batch fails, each row is retried on its own so one bad row does not
+    lose the others; the ledger watermark is then left as it was so the
+    batch is scanned again on restart.
+    
+    Args:
+        payments: (tx_hash, sender, receiver, xrp_amount, usd_amount) tuples
+        last_ledger_index: Ledger watermark to save in the same commit
+        conn: Connection to use; defaults to the writer connection
+    
+    Returns:
+        int: Number of transactions that were new
+    """
+    if not payments and last_ledger_index is None:
+        return 0
+    
+    conn = conn or get_writer_connection()
+    # One pair of timestamps for the whole batch
+    timestamp, ts_unix = _now_timestamps()
+    try:
+        with _writer_lock, conn:
+            changes_before = conn.total_changes
+            conn.executemany(INSERT_SQL, [
+                (tx_hash, sender, receiver, str(xrp_amount), str(usd_amount), timestamp, ts_unix)
+                for tx_hash, sender, receiver, xrp_amount, usd_amount in payments
+            ])
+            new_count = conn.total_changes - changes_before
+            if last_ledger_index is not None:
+                conn.execute(SAVE_LEDGER_INDEX_SQL, (str(last_ledger_index),))
+        return new_count
+    except sqlite3.Error as e:
+        logger.warning("Batch insert of %d transactions failed, retrying individually: %s", len(payments), e)
+        changes_before = conn.total_changes
+        for payment in payments:
+            store_transaction(*payment, conn=conn)
+        return conn.total_changes - changes_before
+
+def get_xrp_to_usd_rate() -> Optional[Decimal]:
+    """
+    Get the XRP to USD exchange rate, fetching it at most once per
+    Config.RATE_CACHE_TTL seconds.
+    
+    Returns:
+        Optional[Decimal]: Exchange rate or None if fetch fails
+    """
+    global _rate_cache
+    rate, fetched_at = _rate_cache
+    if rate is not None and time.monotonic() - fetched_at < Config.RATE_CACHE_TTL:
+        return rate
+    
+    try:
+        response = requests.get(
+            'https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest',
+            params={'symbol': 'XRP', 'convert': 'USD'},
+            headers={
+                'Accepts': 'application/json',
+                'X-CMC_PRO_API_KEY': Config.COINMARKETCAP_API_KEY
+            },
+            timeout=Config.REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        data = response.json(parse_float=Decimal)
+        rate = Decimal(data['data']['XRP']['quote']['USD']['price'])
+    except (requests.RequestException, KeyError, ValueError) as e:
+        logger.error("Error fetching XRP rate: %s", e, exc_info=True)
+        # A stale rate beats recording the payment at 0 USD
+        return rate
+    
+    _rate_cache = (rate, time.monotonic())
+    return rate
+
+def convert_xrp_to_usd(xrp_amount: Decimal, rate: Optional[Decimal]) -> Decimal:
+    """
+    Convert XRP amount to USD at the given exchange rate.
     
     Args:
         xrp_amount: Amount in XRP
+        rate: XRP to USD exchange rate, None if unavailable
     
     Returns:
         Decimal: Amount in USD, 0 if conversion fails
     """
     try:
-        rate = get_xrp_to_usd_rate()
         return xrp_amount * Decimal(str(rate)) if rate else Decimal('0')
     except (TypeError, ValueError) as e:
-        logger.error(f"Error converting XRP to USD: {e}", exc_info=True)
+        logger.error("Error converting XRP to USD: %s", e, exc_info=True)
         return Decimal('0')
 
-def monitor_payments(address: str) -> None:
+class PersistentJsonRpcClient(AsyncJsonRpcClient):
+    """
+    AsyncJsonRpcClient that keeps one HTTP connection open across requests.
+    
+    The stock client opens a new httpx client, and with it a new TCP and TLS
+    handshake, for every request.
+    """
+    
+    def __init__(self, url: str):
+        super().__init__(url)
+        self._http_client = httpx.AsyncClient(timeout=Config.REQUEST_TIMEOUT)
+    
+    async def _request_impl(self, request: Request, **kwargs: Any) -> Response:
+        response = await self._http_client.post(
+            self.url,
+            json=request_to_json_rpc(request),
+            timeout=kwargs.get('timeout', Config.REQUEST_TIMEOUT)
+        )
+        try:
+            return json_to_response(response.json())
+        except JSONDecodeError:
+            raise XRPLRequestFailureException({
+                'error': response.status_code,
+                'error_message': response.text
+            })
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP connection."""
+        await self._http_client.aclose()
+
+async def wait_for_shutdown(timeout: float) -> bool:
+    """
+    Wait up to timeout seconds for shutdown without blocking the event loop.
+    
+    Returns:
+        bool: True if shutdown was requested
+    """
+    return await asyncio.to_thread(shutdown_event.wait, timeout)
+
+async def process_transactions(
+    transactions: List[Dict[str, Any]],
+    address: str,
+    last_ledger_index: Optional[int] = None
+) -> None:
+    """
+    Validate, convert and store a list of transactions.
+    
+    Runs as two flat passes: the first reduces the raw transactions to
+    (tx_hash, sender, drops) tuples, the second converts the whole batch at
+    one exchange rate for a single executemany, so a burst of payments costs
+    at most one rate request.
+    
+    Args:
+        transactions: Transactions in AccountTx shape ({'tx': ..., 'meta': ...})
+        address: Merchant's XRPL address
+        last_ledger_index: Ledger watermark to save with the batch
+    """
+    candidates = []
+    for tx in transactions:
+        drops = validate_payment(tx, address)
+        if drops is None:
+            continue
+        tx_data = tx['tx']
+        try:
+            candidates.append((tx_data['hash'], tx_data['Account'], drops))
+        except KeyError as e:
+            logger.error("Transaction missing field %s: %s", e, tx_data.get('hash'))
+    
+    rate = await asyncio.to_thread(get_xrp_to_usd_rate) if candidates else None
+    
+    pending = []
+    for tx_hash, sender, drops in candidates:
+        # 1 XRP = 10**6 drops; scaleb shifts the exponent instead of dividing
+        xrp_amount = Decimal(drops).scaleb(-6)
+        pending.append((tx_hash, sender, address, xrp_amount, convert_xrp_to_usd(xrp_amount, rate)))
+    
+    new_count = await asyncio.to_thread(store_transactions, pending, last_ledger_index)
+    if new_count:
+        logger.info("Stored %d new of %d payments", new_count, len(pending))
+
+async def backfill_payments(
+    client: PersistentJsonRpcClient,
+    address: str,
+    last_ledger_index: int
+) -> int:
+    """
+    Process every transaction in ledgers after last_ledger_index, oldest first.
+    
+    The watermark is saved with each page's batch. Mid-scan it stops one
+    short of the page's newest ledger, whose transactions may continue on
+    the next page.
+    
+    Args:
+        client: JSON-RPC client
+        address: Merchant's XRPL address
+        last_ledger_index: Highest ledger already scanned, 0 for none
+    
+    Returns:
+        int: Highest ledger index covered by the scan
+    
+    Raises:
+        XRPLRequestFailureException: If the node rejects the request
+    """
+    # Paging with a marker requires repeating the original ledger range
+    ledger_index_min = last_ledger_index + 1 if last_ledger_index else -1
+    marker = None
+    while True:
+        response = await client.request(AccountTx(
+            account=address,
+            ledger_index_min=ledger_index_min,
+            ledger_index_max=-1,
+            forward=True,
+            marker=marker
+        ))
+        if not response.is_successful():
+            raise XRPLRequestFailureException(response.result)
+        response = response.result
+        
+        transactions = response['transactions']
+        marker = response.get('marker')
+        if marker:
+            if transactions:
+                last_ledger_index = max(
+                    last_ledger_index, transactions[-1]['tx']['ledger_index'] - 1
+                )
+        else:
+            last_ledger_index = response.get('ledger_index_max', last_ledger_index)
+        
+        await process_transactions(transactions, address, last_ledger_index)
+        
+        if not marker:
+            return last_ledger_index
+
+async def monitor_payments(address: str) -> None:
     """
     Monitor XRPL for incoming payments to specified address.
     
-    Continuously monitors the XRPL for new payments, validates them,
-    and stores valid transactions in the database.
+    Subscribes to the account over WebSocket so the server pushes each
+    validated transaction as it happens, and backfills anything missed since
+    the last scanned ledger over one kept-alive JSON-RPC connection on every
+    (re)connect. The scanned ledger is persisted, so a restart resumes where
+    it stopped. Rate lookups and database writes run in worker threads so
+    they don't block the loop.
     
     Args:
         address: XRPL address to monitor
     """
-    processed_transactions: Set[str] = set()
-    client = JsonRpcClient(os.getenv('XRPL_NODE_URL', 'https://s.altnet.rippletest.net:51234'))
+    rpc_client = PersistentJsonRpcClient(Config.XRPL_NODE_URL)
+    last_ledger_index = await asyncio.to_thread(load_last_ledger_index)
+    retry_delay = Config.INITIAL_RETRY_DELAY
     
-    logger.info(f"Starting payment monitoring for address: {address}")
+    logger.info("Starting payment monitoring for address: %s", address)
     
-    while not shutdown_event.is_set():
-        try:
-            response = client.request(AccountTx(
-                account=address,
-                ledger_index="validated"
-            )).result
-            
-            for tx in response['transactions']:
-                tx_hash = tx['tx']['hash']
-                if tx_hash not in processed_transactions:
-                    try:
-                        if is_valid_payment(tx, address):
-                            xrp_amount = Decimal(str(tx['meta']['delivered_amount'])) / Decimal('1000000')
-                            usd_amount = convert_xrp_to_usd(xrp_amount)
-                            
-                            if store_transaction(
-                                tx_hash,
-                                tx['tx']['Account'],
-                                address,
-                                xrp_amount,
-                                usd_amount
-                            ):
-                                processed_transactions.add(tx_hash)
-                                logger.info(f"Processed transaction: {tx_hash}")
-                    except Exception as e:
-                        logger.error(f"Error processing transaction {tx_hash}: {e}", exc_info=True)
+    try:
+        while not shutdown_event.is_set():
+            try:
+                async with AsyncWebsocketClient(Config.XRPL_WS_URL) as ws_client:
+                    # Subscribe before backfilling so nothing validated in between is missed
+                    await ws_client.send(Subscribe(accounts=[address]))
+                    last_ledger_index = await backfill_payments(
+                        rpc_client, address, last_ledger_index
+                    )
+                    retry_delay = Config.INITIAL_RETRY_DELAY
+                    
+                    async for message in ws_client:
+                        if shutdown_event.is_set():
+                            break
+                        if message.get('type') != 'transaction' or not message.get('validated'):
+                            continue
+                        
+                        ledger_index = message['ledger_index']
+                        tx = {
+                            'tx': {**message['transaction'], 'ledger_index': ledger_index},
+                            'meta': message['meta']
+                        }
+                        # Other transactions from this ledger may still be on the way
+                        last_ledger_index = max(last_ledger_index, ledger_index - 1)
+                        await process_transactions([tx], address, last_ledger_index)
             
-            shutdown_event.wait(Config.POLLING_INTERVAL)
+            except XRPLRequestFailureException as e:
+                if e.error in Config.PERMANENT_XRPL_ERRORS:
+                    logger.error("XRPL Error, not retrying: %s", e)
+                    break
+                logger.error("XRPL Error: %s", e, exc_info=True)
+            except Exception as e:
+                logger.error("Unexpected error in monitor_payments", exc_info=True)
+            else:
+                continue
             
-        except XRPLRequestError as e:
-            logger.error(f"XRPL Error: {e}", exc_info=True)
-            shutdown_event.wait(Config.RETRY_DELAY)
-        except Exception as e:
-            logger.error("Unexpected error in monitor_payments", exc_info=True)
-            shutdown_event.wait(Config.RETRY_DELAY)
+            # Jittered so many monitors don't retry against the node in lockstep
+            await wait_for_shutdown(retry_delay * random.uniform(0.8, 1.2))
+            retry_delay = min(retry_delay * 2, Config.MAX_RETRY_DELAY)
+    finally:
+        await rpc_client.close()
 
 def cleanup() -> None:
     """Perform cleanup operations before shutdown."""
     shutdown_event.set()
+    close_writer_connection()
     logger.info("Payment monitoring stopped")
 
 if __name__ == '__main__':
@@ -261,7 +631,7 @@ if __name__ == '__main__':
         if not merchant_address:
             raise ValueError("MERCHANT_ADDRESS environment variable not set")
         
-        monitor_payments(merchant_address)
+        asyncio.run(monitor_payments(merchant_address))
     except KeyboardInterrupt:
         logger.info("Shutting down payment monitor...")
     except Exception as e:
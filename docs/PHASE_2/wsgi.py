@@ -0,0 +1,21 @@
+"""
+WSGI entry point for the Phase 2 payment service.
+
+Serve with a single gunicorn worker and a thread pool:
+
+    gunicorn -w 1 -k gthread --threads 8 wsgi:application
+
+Requests are handled concurrently by the worker's threads; with the database
+in WAL mode, readers do not wait on the monitor's writes. Use one worker
+because each worker process would start its own payment monitor, and do not
+pass --preload: background threads started before the fork do not survive it.
+"""
+
+import atexit
+
+from app import app, cleanup, start_background_services
+
+start_background_services()
+atexit.register(cleanup)
+
+application = app
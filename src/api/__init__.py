@@ -25,6 +25,11 @@ def init_app(app: Flask) -> None:
     csrf.init_app(app)
     limiter.init_app(app)
     
+    # jsonify sorts keys and pretty-prints in debug by default; neither is
+    # needed by the dashboard's JSON consumers
+    app.json.sort_keys = False
+    app.json.compact = True
+    
     # Register blueprints
     from .routes import auth, dashboard, payments, settings
     
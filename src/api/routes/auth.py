@@ -3,9 +3,11 @@ Authentication routes for the merchant interface.
 """
 
 import logging
+from functools import wraps
+from typing import Any, Callable, Dict
 from flask import (
     Blueprint, render_template, request, 
-    redirect, url_for, session, current_app
+    redirect, url_for, session, current_app, g
 )
 from werkzeug.security import check_password_hash
 from datetime import datetime
@@ -18,6 +20,32 @@ from services.merchant_service import MerchantService
 logger = logging.getLogger(__name__)
 bp = Blueprint('auth', __name__, url_prefix='/auth')
 
+def login_required(view: Callable[..., Any]) -> Callable[..., Any]:
+    """Redirect to the login page unless a merchant is logged in."""
+    @wraps(view)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not session.get('logged_in'):
+            return redirect(url_for('auth.login'))
+        return view(*args, **kwargs)
+    
+    return wrapper
+
+@bp.before_app_request
+def load_merchant() -> None:
+    """Read the logged-in merchant from the session once per request."""
+    g.merchant_id = session.get('merchant_id') if session.get('logged_in') else None
+
+def current_wallet() -> Dict[str, Any]:
+    """
+    Return the logged-in merchant's wallet, loading it at most once per request.
+    
+    Returns:
+        Wallet data from the wallet service
+    """
+    if 'wallet' not in g:
+        g.wallet = current_app.wallet_service.get_wallet(g.merchant_id)
+    return g.wallet
+
 @bp.route('/login', methods=['GET', 'POST'])
 @metrics_collector.track_request
 def login():
@@ -41,12 +69,14 @@ def login():
                 session['logged_in'] = True
                 session['login_time'] = datetime.utcnow().isoformat()
                 
-                logger.info(f"Successful login for merchant: {username}")
+                logger.info("Successful login for merchant: %s", username)
                 return redirect(url_for('dashboard.index'))
                 
             except AuthError as e:
                 logger.warning(
-                    f"Failed login attempt for {username}: {str(e)}",
+                    "Failed login attempt for %s: %s",
+                    username,
+                    e,
                     extra={"error": str(e)}
                 )
                 return render_template(
@@ -63,7 +93,7 @@ def logout():
     session.clear()
     
     if merchant_id:
-        logger.info(f"Merchant logged out: {merchant_id}")
+        logger.info("Merchant logged out: %s", merchant_id)
     
     return redirect(url_for('auth.login'))
 
@@ -82,12 +112,13 @@ def register():
                     password=request.form['password']
                 )
                 
-                logger.info(f"New merchant registered: {merchant['id']}")
+                logger.info("New merchant registered: %s", merchant['id'])
                 return redirect(url_for('auth.login'))
                 
             except Exception as e:
                 logger.error(
-                    f"Registration failed: {str(e)}",
+                    "Registration failed: %s",
+                    e,
                     extra={"error": str(e)}
                 )
                 return render_template(
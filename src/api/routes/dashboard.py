@@ -5,8 +5,12 @@ This module handles all dashboard-related routes including the main dashboard vi
 analytics, metrics, and real-time transaction monitoring.
 """
 
+import json
 import logging
+import threading
 from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 from flask import (
     Blueprint, render_template, session,
     current_app, jsonify, Response
@@ -21,6 +25,13 @@ from .auth import login_required
 logger = logging.getLogger(__name__)
 bp = Blueprint('dashboard', __name__)
 
+# Shared pool for the dashboard's independent, I/O-bound service calls
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='dashboard')
+
+# merchant_id -> (payment_count, dashboard data); short TTL absorbs refresh bursts
+_dashboard_cache: TTLCache = TTLCache(maxsize=1024, ttl=2)
+_dashboard_cache_lock = threading.Lock()
+
 @bp.route('/')
 @login_required
 @metrics_collector.track_request
@@ -40,12 +51,14 @@ def index() -> str:
             return render_template('auth/login.html')
             
         try:
-            dashboard_data = _fetch_dashboard_data(merchant_id)
+            dashboard_data = _get_dashboard_data(merchant_id)
             return render_template('dashboard/index.html', **dashboard_data)
             
         except Exception as e:
             logger.error(
-                f"Dashboard error for merchant {merchant_id}: {str(e)}",
+                "Dashboard error for merchant %s: %s",
+                merchant_id,
+                e,
                 exc_info=True
             )
             metrics_collector.increment_error_counter('dashboard_view')
@@ -54,10 +67,37 @@ def index() -> str:
                 error="Dashboard temporarily unavailable"
             )
 
+def _get_dashboard_data(merchant_id: str) -> Dict[str, Any]:
+    """
+    Get dashboard data, reusing a fetch from the last couple of seconds.
+    
+    Cached data is dropped as soon as the payment monitor processes a new
+    payment, so incoming payments still show up immediately.
+    
+    Args:
+        merchant_id: Unique identifier for the merchant
+        
+    Returns:
+        Dictionary containing all dashboard data
+    """
+    payment_count = current_app.payment_monitor.payment_count
+    with _dashboard_cache_lock:
+        cached = _dashboard_cache.get(merchant_id)
+    if cached is not None and cached[0] == payment_count:
+        return cached[1]
+    
+    dashboard_data = _fetch_dashboard_data(merchant_id)
+    with _dashboard_cache_lock:
+        _dashboard_cache[merchant_id] = (payment_count, dashboard_data)
+    return dashboard_data
+
 def _fetch_dashboard_data(merchant_id: str) -> Dict[str, Any]:
     """
     Fetch all required data for dashboard display.
     
+    The service calls don't depend on each other (apart from transactions
+    needing the wallet address), so they run concurrently on a shared pool.
+    
     Args:
         merchant_id: Unique identifier for the merchant
         
@@ -68,22 +108,33 @@ def _fetch_dashboard_data(merchant_id: str) -> Dict[str, Any]:
         DashboardError: If any data fetch fails
     """
     try:
-        # Get required services
+        # Get required services (resolved once; the workers have no app context)
         wallet_service = current_app.wallet_service
         payment_monitor = current_app.payment_monitor
         rate_service = current_app.rate_service
         analytics_service = current_app.analytics_service
         
-        # Fetch wallet information
-        wallet = wallet_service.get_wallet(merchant_id)
-        balance_xrp = wallet_service.get_balance(merchant_id)
+        # Start the independent fetches
+        wallet_future = _executor.submit(wallet_service.get_wallet, merchant_id)
+        balance_future = _executor.submit(wallet_service.get_balance, merchant_id)
+        # All exchange rates in one backend round-trip
+        rates_future = _executor.submit(rate_service.get_rates, ['USD', 'EUR', 'GBP'])
+        analytics_future = _executor.submit(
+            analytics_service.get_merchant_analytics,
+            merchant_id=merchant_id,
+            timeframe='24h'
+        )
+        
+        # Recent transactions need the wallet address
+        wallet = wallet_future.result()
+        transactions_future = _executor.submit(
+            payment_monitor.get_recent_transactions,
+            address=wallet['classic_address'],
+            limit=10
+        )
         
-        # Get current exchange rates
-        rates = {
-            'USD': rate_service.get_rate('USD'),
-            'EUR': rate_service.get_rate('EUR'),
-            'GBP': rate_service.get_rate('GBP')
-        }
+        balance_xrp = balance_future.result()
+        rates = rates_future.result()
         
         # Calculate fiat balances
         balances = {
@@ -91,17 +142,8 @@ def _fetch_dashboard_data(merchant_id: str) -> Dict[str, Any]:
             for currency, rate in rates.items()
         }
         
-        # Get recent transactions
-        transactions = payment_monitor.get_recent_transactions(
-            address=wallet['classic_address'],
-            limit=10
-        )
-        
-        # Get analytics data
-        analytics = analytics_service.get_merchant_analytics(
-            merchant_id=merchant_id,
-            timeframe='24h'
-        )
+        transactions = transactions_future.result()
+        analytics = analytics_future.result()
         
         return {
             'wallet': wallet,
@@ -161,7 +203,9 @@ def get_metrics() -> Response:
             
         except Exception as e:
             logger.error(
-                f"Metrics error for merchant {merchant_id}: {str(e)}",
+                "Metrics error for merchant %s: %s",
+                merchant_id,
+                e,
                 exc_info=True
             )
             return jsonify({
@@ -177,6 +221,9 @@ def live_transactions() -> Response:
     """
     Stream live transaction updates via Server-Sent Events.
     
+    Events are serialized with json.dumps directly; jsonify builds a whole
+    Response per call and is kept for request-boundary responses.
+    
     Returns:
         SSE stream of transaction updates
     """
@@ -188,11 +235,12 @@ def live_transactions() -> Response:
             for transaction in current_app.payment_monitor.stream_transactions(
                 address=wallet['classic_address']
             ):
-                yield f"data: {jsonify(transaction).data.decode()}\n\n"
+                payload = json.dumps(transaction, separators=(',', ':'), default=str)
+                yield f"data: {payload}\n\n"
                 
         except Exception as e:
-            logger.error(f"Live transaction stream error: {str(e)}")
-            yield f"data: {jsonify({'error': 'Stream ended'}).data.decode()}\n\n"
+            logger.error("Live transaction stream error: %s", e)
+            yield 'data: {"error":"Stream ended"}\n\n'
     
     return Response(
         generate(),
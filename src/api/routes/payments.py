@@ -6,24 +6,30 @@ QR code generation, and payment status tracking.
 """
 
 import logging
-from typing import Dict, Any
+import functools
+from typing import Dict, Any, Iterator
 from flask import (
     Blueprint, render_template, request, 
-    jsonify, current_app, session, Response
+    jsonify, current_app, g, Response,
+    stream_template
 )
 from datetime import datetime
-import qrcode
+from urllib.parse import urlencode
+import segno
 import io
 import base64
 
 from core.error_handlers import error_context
 from core.metrics import metrics_collector
 from core.exceptions import PaymentError
-from .auth import login_required
+from .auth import login_required, current_wallet
 
 logger = logging.getLogger(__name__)
 bp = Blueprint('payments', __name__, url_prefix='/payments')
 
+_DATA_URI_PREFIX = b'data:image/png;base64,'
+_HISTORY_STREAM_ERROR = '<p class="error">Failed to load payment history</p>'
+
 @bp.route('/request', methods=['GET', 'POST'])
 @login_required
 @metrics_collector.track_request
@@ -52,7 +58,7 @@ def create_request() -> str:
                 )
                 
             except Exception as e:
-                logger.error(f"Payment request creation failed: {str(e)}")
+                logger.error("Payment request creation failed: %s", e)
                 return render_template(
                     'error.html',
                     error="Failed to create payment request"
@@ -60,6 +66,32 @@ def create_request() -> str:
     
     return render_template('payments/create_request.html')
 
+@functools.lru_cache(maxsize=1024)
+def _render_qr_data_uri(payload: str) -> str:
+    """
+    Render a QR code for payload as a base64 PNG data URI.
+    
+    Identical payment requests produce identical images, so renders are
+    memoized by payload.
+    
+    Args:
+        payload: Payment URI to encode
+        
+    Returns:
+        data:image/png;base64 URI of the QR code
+    """
+    img_buffer = io.BytesIO()
+    # segno picks the smallest version from its capacity table in one pass
+    # (no fit/retry loop); boost_error=False keeps it from re-checking
+    # higher error levels, so level L is used as requested
+    qr = segno.make(payload, error='l', boost_error=False)
+    # QR modules compress well at any level; 9 only costs CPU
+    qr.save(
+        img_buffer, kind='png', scale=10, border=4, compresslevel=1
+    )
+    # getbuffer() hands b64encode a view instead of copying the PNG out first
+    return (_DATA_URI_PREFIX + base64.b64encode(img_buffer.getbuffer())).decode('ascii')
+
 def _create_payment_request(
     amount: float,
     currency: str,
@@ -79,8 +111,8 @@ def _create_payment_request(
     Raises:
         PaymentError: If request creation fails
     """
-    merchant_id = session['merchant_id']
-    wallet = current_app.wallet_service.get_wallet(merchant_id)
+    merchant_id = g.merchant_id
+    wallet = current_wallet()
     
     try:
         # Convert to XRP amount
@@ -102,22 +134,14 @@ def _create_payment_request(
             ).isoformat()
         }
         
-        # Generate QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(payment_data)
-        qr.make(fit=True)
-        
-        # Convert QR code to base64 image
-        img_buffer = io.BytesIO()
-        qr.make_image().save(img_buffer, format='PNG')
-        img_str = base64.b64encode(img_buffer.getvalue()).decode()
+        # Encode a payment URI wallets can scan, not the dict's repr
+        query = {'amount': f"{xrp_amount:.6f}"}
+        if description:
+            query['label'] = description
+        payment_uri = f"ripple:{wallet['classic_address']}?{urlencode(query)}"
         
-        payment_data['qr_code'] = f"data:image/png;base64,{img_str}"
+        # Generate QR code (timestamps stay out of the cache key)
+        payment_data['qr_code'] = _render_qr_data_uri(payment_uri)
         
         # Store payment request
         current_app.payment_service.store_request(payment_data)
@@ -156,7 +180,7 @@ def check_status(request_id: str) -> Response:
             })
             
         except Exception as e:
-            logger.error(f"Status check failed: {str(e)}")
+            logger.error("Status check failed: %s", e)
             return jsonify({
                 'status': 'error',
                 'message': 'Failed to check payment status'
@@ -165,31 +189,49 @@ def check_status(request_id: str) -> Response:
 @bp.route('/history')
 @login_required
 @metrics_collector.track_request
-def payment_history() -> str:
+def payment_history() -> Response:
     """
     Show merchant's payment history.
     
+    The history is rendered with a streaming template so rows are sent as
+    they are read instead of materializing the whole list first.
+    
     Returns:
-        Rendered payment history template
+        Streamed payment history template
     """
     with error_context("payment_history"):
-        merchant_id = session['merchant_id']
+        merchant_id = g.merchant_id
         
         try:
-            # Get payment history
             history = current_app.payment_service.get_merchant_history(
                 merchant_id=merchant_id,
                 limit=50
             )
             
-            return render_template(
-                'payments/history.html',
-                payments=history
-            )
+            # stream_template keeps the request context for the stream
+            return Response(_guard_history_stream(
+                stream_template('payments/history.html', payments=history),
+                merchant_id
+            ))
             
         except Exception as e:
-            logger.error(f"Failed to fetch payment history: {str(e)}")
+            logger.error("Failed to fetch payment history: %s", e)
             return render_template(
                 'error.html',
                 error="Failed to load payment history"
-            ) 
\ No newline at end of file
+            )
+
+def _guard_history_stream(chunks: Iterator[str], merchant_id: str) -> Iterator[str]:
+    """
+    Yield rendered history chunks, ending the page on a rendering error.
+    
+    The response has already started by then, so the error is logged and
+    appended to the page rather than replacing it.
+    """
+    try:
+        yield from chunks
+    except Exception as e:
+        logger.error(
+            "Payment history stream failed for %s: %s", merchant_id, e, exc_info=True
+        )
+        yield _HISTORY_STREAM_ERROR
@@ -6,10 +6,11 @@ management.
 """
 
 import logging
-from typing import Dict, Any
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional
 from flask import (
     Blueprint, render_template, request, 
-    redirect, url_for, current_app, session
+    redirect, url_for, current_app, g
 )
 
 from core.error_handlers import error_context
@@ -20,6 +21,100 @@ from .auth import login_required
 logger = logging.getLogger(__name__)
 bp = Blueprint('settings', __name__, url_prefix='/settings')
 
+def _parse_number(form_data: Dict[str, Any], field: str, type_: type, default: Any) -> Any:
+    """Parse a numeric form field, naming the field if it is invalid."""
+    try:
+        return type_(form_data.get(field, default))
+    except (TypeError, ValueError):
+        raise SettingsError(
+            f"Invalid value for {field}",
+            details={'field': field, 'value': form_data.get(field)}
+        )
+
+@dataclass(frozen=True)
+class SettingsForm:
+    """Typed merchant settings parsed from the settings form."""
+    
+    business_name: Optional[str]
+    contact_email: Optional[str]
+    default_currency: Optional[str]
+    notify_email: bool
+    notify_sms: bool
+    notify_webhook: bool
+    webhook_url: Optional[str]
+    auto_convert: bool
+    settlement_currency: Optional[str]
+    minimum_settlement: float
+    
+    @classmethod
+    def from_form(cls, form_data: Dict[str, Any]) -> 'SettingsForm':
+        """
+        Parse and validate submitted form data.
+        
+        Raises:
+            SettingsError: If a numeric field is invalid
+        """
+        return cls(
+            business_name=form_data.get('business_name'),
+            contact_email=form_data.get('contact_email'),
+            default_currency=form_data.get('default_currency'),
+            notify_email=form_data.get('notify_email') == 'on',
+            notify_sms=form_data.get('notify_sms') == 'on',
+            notify_webhook=form_data.get('notify_webhook') == 'on',
+            webhook_url=form_data.get('webhook_url'),
+            auto_convert=form_data.get('auto_convert') == 'on',
+            settlement_currency=form_data.get('settlement_currency'),
+            minimum_settlement=_parse_number(form_data, 'minimum_settlement', float, 0)
+        )
+    
+    def to_settings(self) -> Dict[str, Any]:
+        """Build the settings structure stored by the merchant service."""
+        return {
+            'business_name': self.business_name,
+            'contact_email': self.contact_email,
+            'default_currency': self.default_currency,
+            'notification_preferences': {
+                'email': self.notify_email,
+                'sms': self.notify_sms,
+                'webhook': self.notify_webhook
+            },
+            'webhook_url': self.webhook_url,
+            'settlement_preferences': {
+                'auto_convert': self.auto_convert,
+                'settlement_currency': self.settlement_currency,
+                'minimum_settlement': self.minimum_settlement
+            }
+        }
+
+@dataclass(frozen=True)
+class SecuritySettingsForm:
+    """Typed security settings parsed from the security form."""
+    
+    two_factor_enabled: bool
+    ip_whitelist: List[str]
+    api_key_expiry: int
+    password_expiry: int
+    session_timeout: int
+    
+    @classmethod
+    def from_form(cls, form_data: Dict[str, Any]) -> 'SecuritySettingsForm':
+        """
+        Parse and validate submitted form data.
+        
+        Raises:
+            SettingsError: If a numeric field is invalid
+        """
+        return cls(
+            two_factor_enabled=form_data.get('2fa_enabled') == 'on',
+            ip_whitelist=[
+                ip.strip() for ip in form_data.get('ip_whitelist', '').split(',')
+                if ip.strip()
+            ],
+            api_key_expiry=_parse_number(form_data, 'api_key_expiry', int, 30),
+            password_expiry=_parse_number(form_data, 'password_expiry', int, 90),
+            session_timeout=_parse_number(form_data, 'session_timeout', int, 60)
+        )
+
 @bp.route('/', methods=['GET', 'POST'])
 @login_required
 @metrics_collector.track_request
@@ -30,7 +125,7 @@ def index() -> str:
     Returns:
         Rendered settings template
     """
-    merchant_id = session['merchant_id']
+    merchant_id = g.merchant_id
     
     if request.method == 'POST':
         with error_context("settings_update"):
@@ -39,7 +134,7 @@ def index() -> str:
                 return redirect(url_for('settings.index'))
                 
             except Exception as e:
-                logger.error(f"Settings update failed: {str(e)}")
+                logger.error("Settings update failed: %s", e)
                 return render_template(
                     'settings/index.html',
                     error="Failed to update settings",
@@ -83,30 +178,15 @@ def _update_settings(merchant_id: str, form_data: Dict[str, Any]) -> None:
     Raises:
         SettingsError: If settings update fails
     """
+    settings = SettingsForm.from_form(form_data)
+    
     try:
-        settings = {
-            'business_name': form_data.get('business_name'),
-            'contact_email': form_data.get('contact_email'),
-            'default_currency': form_data.get('default_currency'),
-            'notification_preferences': {
-                'email': form_data.get('notify_email') == 'on',
-                'sms': form_data.get('notify_sms') == 'on',
-                'webhook': form_data.get('notify_webhook') == 'on'
-            },
-            'webhook_url': form_data.get('webhook_url'),
-            'settlement_preferences': {
-                'auto_convert': form_data.get('auto_convert') == 'on',
-                'settlement_currency': form_data.get('settlement_currency'),
-                'minimum_settlement': float(form_data.get('minimum_settlement', 0))
-            }
-        }
-        
         current_app.merchant_service.update_settings(
             merchant_id=merchant_id,
-            settings=settings
+            settings=settings.to_settings()
         )
         
-        logger.info(f"Settings updated for merchant: {merchant_id}")
+        logger.info("Settings updated for merchant: %s", merchant_id)
         
     except Exception as e:
         raise SettingsError(
@@ -124,7 +204,7 @@ def security_settings() -> str:
     Returns:
         Rendered security settings template
     """
-    merchant_id = session['merchant_id']
+    merchant_id = g.merchant_id
     
     if request.method == 'POST':
         with error_context("security_settings_update"):
@@ -133,7 +213,7 @@ def security_settings() -> str:
                 return redirect(url_for('settings.security_settings'))
                 
             except Exception as e:
-                logger.error(f"Security settings update failed: {str(e)}")
+                logger.error("Security settings update failed: %s", e)
                 return render_template(
                     'settings/security.html',
                     error="Failed to update security settings",
@@ -160,21 +240,15 @@ def _update_security_settings(
     form_data: Dict[str, Any]
 ) -> None:
     """Update security settings."""
+    settings = SecuritySettingsForm.from_form(form_data)
+    
     try:
-        settings = {
-            'two_factor_enabled': form_data.get('2fa_enabled') == 'on',
-            'ip_whitelist': form_data.get('ip_whitelist', '').split(','),
-            'api_key_expiry': int(form_data.get('api_key_expiry', 30)),
-            'password_expiry': int(form_data.get('password_expiry', 90)),
-            'session_timeout': int(form_data.get('session_timeout', 60))
-        }
-        
         current_app.merchant_service.update_security_settings(
             merchant_id=merchant_id,
-            settings=settings
+            settings=asdict(settings)
         )
         
-        logger.info(f"Security settings updated for merchant: {merchant_id}")
+        logger.info("Security settings updated for merchant: %s", merchant_id)
         
     except Exception as e:
         raise SettingsError(
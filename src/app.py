@@ -67,31 +67,54 @@ def create_app() -> Flask:
     app.wallet_service = WalletService()
     app.payment_monitor = PaymentMonitor(
         merchant_address=Config.MERCHANT_ADDRESS,
-        alert_manager=AlertManager('config/alerts.json')
+        alert_manager=AlertManager('config/alerts.json'),
+        node_url=Config.XRPL_NODE_URL
     )
     
+    warm_up(app)
+    
+    return app
+
+
+def warm_up(app: Flask) -> None:
+    """Build the URL matcher and compile every template before serving."""
+    # Werkzeug otherwise builds the matcher on the first request
+    app.url_map.update()
+    
+    # Fills the Jinja cache so no request pays for template compilation
+    for template_name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(template_name)
+
+
+def start_app() -> Flask:
+    """
+    Validate configuration, start the background services and build the app.
+    
+    Shared by the development server and the WSGI entry point (wsgi.py).
+    """
+    # Validate configuration
+    Config.validate()
+    
+    # Setup logging
+    setup_logging()
+    logger.info("Starting fleXRP application")
+    
+    # Start metrics server
+    start_http_server(Config.METRICS_PORT)
+    logger.info("Metrics server started on port %s", Config.METRICS_PORT)
+    
+    # Create and start application
+    app = create_app()
+    app.payment_monitor.start()
     return app
 
 
 def main() -> None:
-    """Application entry point."""
+    """Development entry point; serve production traffic through wsgi.py."""
     try:
-        # Validate configuration
-        Config.validate()
-        
-        # Setup logging
-        setup_logging()
-        logger.info("Starting fleXRP application")
-        
-        # Start metrics server
-        start_http_server(Config.METRICS_PORT)
-        logger.info(f"Metrics server started on port {Config.METRICS_PORT}")
-        
-        # Create and start application
-        app = create_app()
-        app.payment_monitor.start()
+        app = start_app()
         
-        # Start Flask application
+        # Start Flask development server
         app.run(host='0.0.0.0', port=5000)
         
     except Exception as e:
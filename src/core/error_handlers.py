@@ -6,10 +6,12 @@ retry logic, circuit breakers, and error tracking.
 """
 
 import time
+import random
+import asyncio
 import logging
-from typing import Any, Callable, Optional, TypeVar, Dict
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar, Dict
 from functools import wraps
-from datetime import datetime, timedelta
+from datetime import datetime
 from contextlib import contextmanager
 
 from .exceptions import FleXRPError, XRPLError, APIError
@@ -33,7 +35,8 @@ class CircuitBreaker:
         self.recovery_timeout = recovery_timeout
         self.half_open_timeout = half_open_timeout
         self.failures = 0
-        self.last_failure_time: Optional[datetime] = None
+        # time.monotonic() of the last failure; immune to wall-clock changes
+        self.last_failure_time: float = 0.0
         self.state = "CLOSED"
 
     def can_execute(self) -> bool:
@@ -42,7 +45,7 @@ class CircuitBreaker:
             return True
         
         if self.state == "OPEN":
-            if (datetime.utcnow() - self.last_failure_time) > timedelta(seconds=self.recovery_timeout):
+            if time.monotonic() - self.last_failure_time > self.recovery_timeout:
                 self.state = "HALF_OPEN"
                 return True
             return False
@@ -57,44 +60,97 @@ class CircuitBreaker:
     def record_failure(self) -> None:
         """Record failed execution."""
         self.failures += 1
-        self.last_failure_time = datetime.utcnow()
+        self.last_failure_time = time.monotonic()
         
         if self.failures >= self.failure_threshold:
             self.state = "OPEN"
 
 
+def is_retryable(error: Exception) -> bool:
+    """Default retry predicate: everything except non-retryable FleXRPErrors."""
+    return not isinstance(error, FleXRPError) or error.retryable
+
+
+def _retry_delays(
+    max_attempts: int,
+    initial_delay: float,
+    max_delay: float,
+    exponential: bool
+) -> Iterator[float]:
+    """Yield the jittered wait before each retry."""
+    delay = initial_delay
+    for _ in range(max_attempts - 1):
+        # Jitter keeps concurrent callers from retrying in lockstep
+        yield delay * random.uniform(0.8, 1.2)
+        if exponential:
+            delay = min(delay * 2, max_delay)
+
+
 def with_retry(
     max_attempts: int = 3,
     initial_delay: float = 1.0,
     max_delay: float = 30.0,
     exponential: bool = True,
-    exceptions: tuple = (Exception,)
+    exceptions: tuple = (Exception,),
+    retry_if: Callable[[Exception], bool] = is_retryable
 ) -> Callable:
-    """Retry decorator with exponential backoff."""
+    """
+    Retry decorator with jittered exponential backoff.
+    
+    Only exceptions of the given types for which retry_if returns True are
+    retried; anything else is raised immediately. Use with_async_retry for
+    coroutines so the backoff doesn't block the event loop.
+    """
     
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> T:
-            delay = initial_delay
-            last_exception = None
-            
-            for attempt in range(max_attempts):
+            delays = _retry_delays(max_attempts, initial_delay, max_delay, exponential)
+            attempt = 1
+            while True:
                 try:
                     return func(*args, **kwargs)
                 except exceptions as e:
-                    last_exception = e
+                    delay = next(delays, None)
+                    if delay is None or not retry_if(e):
+                        raise
                     logger.warning(
-                        f"Attempt {attempt + 1}/{max_attempts} failed: {str(e)}"
+                        "Attempt %d/%d failed: %s", attempt, max_attempts, e
                     )
-                    
-                    if attempt + 1 == max_attempts:
-                        break
-                        
-                    time.sleep(delay)
-                    if exponential:
-                        delay = min(delay * 2, max_delay)
+                attempt += 1
+                time.sleep(delay)
             
-            raise last_exception
+        return wrapper
+    return decorator
+
+
+def with_async_retry(
+    max_attempts: int = 3,
+    initial_delay: float = 1.0,
+    max_delay: float = 30.0,
+    exponential: bool = True,
+    exceptions: tuple = (Exception,),
+    retry_if: Callable[[Exception], bool] = is_retryable
+) -> Callable:
+    """Coroutine counterpart of with_retry, backing off with asyncio.sleep."""
+    
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            delays = _retry_delays(max_attempts, initial_delay, max_delay, exponential)
+            attempt = 1
+            while True:
+                try:
+                    return await func(*args, **kwargs)
+                except exceptions as e:
+                    delay = next(delays, None)
+                    if delay is None or not retry_if(e):
+                        raise
+                    logger.warning(
+                        "Attempt %d/%d failed: %s", attempt, max_attempts, e
+                    )
+                attempt += 1
+                await asyncio.sleep(delay)
             
         return wrapper
     return decorator
@@ -117,7 +173,9 @@ def error_context(
         })
         
         logger.error(
-            f"Error in {operation}: {str(e)}",
+            "Error in %s: %s",
+            operation,
+            e,
             extra={"error_details": details},
             exc_info=True
         )
@@ -5,8 +5,14 @@ This module defines the exception hierarchy and provides base exception
 classes for different types of errors that can occur in the system.
 """
 
-from typing import Optional, Dict, Any
+import time
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping
 from datetime import datetime
+from functools import cached_property
+
+# Shared by every exception raised without details
+_EMPTY_DETAILS: Mapping[str, Any] = MappingProxyType({})
 
 
 class FleXRPError(Exception):
@@ -16,20 +22,34 @@ class FleXRPError(Exception):
         self, 
         message: str, 
         code: Optional[str] = None,
-        details: Optional[Dict[str, Any]] = None
+        details: Optional[Dict[str, Any]] = None,
+        retryable: bool = True
     ) -> None:
         self.message = message
         self.code = code or "FLEX_ERR"
-        self.details = details or {}
-        self.timestamp = datetime.utcnow()
+        self._details = details
+        # False for failures a retry cannot fix (e.g. a rejected API key)
+        self.retryable = retryable
+        # A float is cheap; the datetime is only built if someone asks for it
+        self._created_at = time.time()
         super().__init__(self.message)
 
+    @property
+    def details(self) -> Mapping[str, Any]:
+        """Extra error context; read-only and empty when none was given."""
+        return self._details or _EMPTY_DETAILS
+
+    @cached_property
+    def timestamp(self) -> datetime:
+        """UTC time the exception was created."""
+        return datetime.utcfromtimestamp(self._created_at)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert exception to dictionary format."""
         return {
             "error": self.code,
             "message": self.message,
-            "details": self.details,
+            "details": dict(self.details),
             "timestamp": self.timestamp.isoformat()
         }
 
@@ -40,12 +60,14 @@ class XRPLError(FleXRPError):
     def __init__(
         self, 
         message: str, 
-        details: Optional[Dict[str, Any]] = None
+        details: Optional[Dict[str, Any]] = None,
+        retryable: bool = True
     ) -> None:
         super().__init__(
             message=message,
             code="XRPL_ERR",
-            details=details
+            details=details,
+            retryable=retryable
         )
 
 
@@ -55,12 +77,14 @@ class APIError(FleXRPError):
     def __init__(
         self, 
         message: str, 
-        details: Optional[Dict[str, Any]] = None
+        details: Optional[Dict[str, Any]] = None,
+        retryable: bool = True
     ) -> None:
         super().__init__(
             message=message,
             code="API_ERR",
-            details=details
+            details=details,
+            retryable=retryable
         )
 
 
@@ -76,4 +100,19 @@ class DatabaseError(FleXRPError):
             message=message,
             code="DB_ERR",
             details=details
-        ) 
\ No newline at end of file
+        ) 
+
+class SettingsError(FleXRPError):
+    """Merchant settings errors."""
+    
+    def __init__(
+        self, 
+        message: str, 
+        details: Optional[Dict[str, Any]] = None
+    ) -> None:
+        super().__init__(
+            message=message,
+            code="SETTINGS_ERR",
+            details=details,
+            retryable=False
+        )
@@ -6,13 +6,22 @@ for system health and performance tracking.
 """
 
 import time
-from typing import Dict, Any, Optional
+import atexit
+import threading
+from collections import Counter as TallyCounter
+from typing import Dict, Any, Optional, Callable, TypeVar, Tuple
+from functools import wraps
 from datetime import datetime
 import logging
 from prometheus_client import Counter, Histogram, Gauge
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+# How often buffered error counts are pushed to Prometheus
+ERROR_FLUSH_INTERVAL = 0.25
+
 # Metrics definitions
 METRICS = {
     'errors': Counter(
@@ -29,19 +38,68 @@ METRICS = {
         'flexrp_transaction_processing_seconds',
         'Transaction processing time in seconds'
     ),
+    'wallet_creation_time': Histogram(
+        'flexrp_wallet_creation_seconds',
+        'Wallet creation time in seconds'
+    ),
     'active_connections': Gauge(
         'flexrp_active_connections',
         'Number of active connections',
         ['type']
+    ),
+    'cache_lookups': Counter(
+        'flexrp_cache_lookups_total',
+        'Cache lookups by cache and result (hit or miss)',
+        ['cache', 'result']
     )
 }
 
 
+class _PooledTimer:
+    """
+    Reusable latency timer bound to one histogram (or labelled child).
+    
+    Start times live on a per-thread stack, so one instance can be entered
+    concurrently from several threads and re-entered within one.
+    """
+    
+    __slots__ = ('_histogram', '_local')
+    
+    def __init__(self, histogram: Any):
+        self._histogram = histogram
+        self._local = threading.local()
+    
+    def __enter__(self) -> '_PooledTimer':
+        starts = getattr(self._local, 'starts', None)
+        if starts is None:
+            starts = self._local.starts = []
+        starts.append(time.perf_counter())
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self._histogram.observe(time.perf_counter() - self._local.starts.pop())
+
+
 class MetricsCollector:
     """Collector for system metrics and performance data."""
     
     def __init__(self):
         self.metrics = METRICS
+        # Labelled children cached by label values; .labels() takes a lock
+        self._latency_children: Dict[str, Any] = {}
+        self._error_children: Dict[Tuple[str, str], Any] = {}
+        # One reusable timer per metric and label set
+        self._timers: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], _PooledTimer] = {}
+        # Error increments are tallied here and flushed in batches
+        self._pending_errors: TallyCounter = TallyCounter()
+        self._lock = threading.Lock()
+        self._stop_flusher = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop,
+            name='metrics-error-flusher',
+            daemon=True
+        )
+        self._flusher.start()
 
     def increment_error_counter(
         self,
@@ -49,10 +107,40 @@ class MetricsCollector:
         operation: str
     ) -> None:
         """Increment error counter for specific type and operation."""
-        self.metrics['errors'].labels(
-            error_type=error_type,
-            operation=operation
-        ).inc()
+        with self._lock:
+            self._pending_errors[(error_type, operation)] += 1
+
+    def flush_error_counts(self) -> None:
+        """Push buffered error counts to Prometheus, one inc() per label set."""
+        with self._lock:
+            if not self._pending_errors:
+                return
+            pending = self._pending_errors
+            self._pending_errors = TallyCounter()
+
+        for key, count in pending.items():
+            child = self._error_children.get(key)
+            if child is None:
+                error_type, operation = key
+                child = self._error_children[key] = self.metrics['errors'].labels(
+                    error_type=error_type,
+                    operation=operation
+                )
+            child.inc(count)
+
+    def _flush_loop(self) -> None:
+        """Background loop flushing error counts every ERROR_FLUSH_INTERVAL."""
+        while not self._stop_flusher.wait(ERROR_FLUSH_INTERVAL):
+            try:
+                self.flush_error_counts()
+            except Exception as e:
+                logger.error("Failed to flush error metrics: %s", e)
+
+    def stop(self) -> None:
+        """Stop the flusher thread and push any remaining error counts."""
+        self._stop_flusher.set()
+        self._flusher.join(timeout=1.0)
+        self.flush_error_counts()
 
     def record_api_latency(
         self,
@@ -60,9 +148,12 @@ class MetricsCollector:
         duration: float
     ) -> None:
         """Record API call latency."""
-        self.metrics['api_latency'].labels(
-            endpoint=endpoint
-        ).observe(duration)
+        child = self._latency_children.get(endpoint)
+        if child is None:
+            child = self._latency_children.setdefault(endpoint, self.metrics['api_latency'].labels(
+                endpoint=endpoint
+            ))
+        child.observe(duration)
 
     def update_connection_count(
         self,
@@ -74,26 +165,61 @@ class MetricsCollector:
             type=connection_type
         ).set(count)
 
-    @contextmanager
+    def record_cache_lookup(
+        self,
+        cache: str,
+        result: str,
+        count: int = 1
+    ) -> None:
+        """Record cache hits or misses."""
+        self.metrics['cache_lookups'].labels(
+            cache=cache,
+            result=result
+        ).inc(count)
+
+    def track_request(self, func: Callable[..., T]) -> Callable[..., T]:
+        """Decorator recording a view's latency under its function name."""
+        # Resolve the labelled child once at decoration time, not per request
+        latency = self.metrics['api_latency'].labels(endpoint=func.__name__)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            start_time = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                latency.observe(time.perf_counter() - start_time)
+
+        return wrapper
+
+    def timer(self, metric_name: str, **labels: str) -> _PooledTimer:
+        """
+        Return the shared timer for a histogram and label set.
+        
+        Use as a context manager; the same object is handed out on every
+        call, so timing allocates nothing per measurement.
+        """
+        key = (metric_name, tuple(sorted(labels.items())))
+        timer = self._timers.get(key)
+        if timer is None:
+            histogram = self.metrics[metric_name]
+            if labels:
+                histogram = histogram.labels(**labels)
+            timer = self._timers.setdefault(key, _PooledTimer(histogram))
+        return timer
+
     def measure_latency(
         self,
         metric_name: str,
         labels: Optional[Dict[str, str]] = None
-    ):
+    ) -> _PooledTimer:
         """Context manager to measure operation latency."""
-        start_time = time.time()
-        try:
-            yield
-        finally:
-            duration = time.time() - start_time
-            if labels:
-                self.metrics[metric_name].labels(**labels).observe(duration)
-            else:
-                self.metrics[metric_name].observe(duration)
+        return self.timer(metric_name, **(labels or {}))
 
 
 # Global metrics collector instance
 metrics_collector = MetricsCollector()
+atexit.register(metrics_collector.stop)
 
 
 def increment_error_counter(operation: str, error_type: Optional[str] = None) -> None:
@@ -107,7 +233,8 @@ def increment_error_counter(operation: str, error_type: Optional[str] = None) ->
 def record_error_details(operation: str, details: Dict[str, Any]) -> None:
     """Record detailed error information for analysis."""
     logger.error(
-        f"Operation error: {operation}",
+        "Operation error: %s",
+        operation,
         extra={
             "error_details": details,
             "timestamp": datetime.utcnow().isoformat()
@@ -6,11 +6,15 @@ generation for system issues and anomalies.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Dict, Any, Deque, List, Mapping, Optional
 from dataclasses import dataclass
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +23,8 @@ class AlertConfig:
     """Alert configuration settings."""
     
     type: str
-    threshold: float
+    value_threshold: float  # a value at or above this counts as a breach
+    count_threshold: int  # breaches within the window needed to alert
     window: int
     severity: str
     channels: List[str]
@@ -29,51 +34,81 @@ class AlertManager:
     """Manager for system alerts and notifications."""
     
     def __init__(self, config_path: str):
+        self.slack_webhook_url: Optional[str] = None
         self.config = self._load_config(config_path)
-        self.alert_history: Dict[str, List[datetime]] = {}
-
-    def _load_config(self, config_path: str) -> Dict[str, Any]:
-        """Load alert configuration from file."""
+        # time.monotonic() of each recent threshold breach, per alert type
+        self.alert_history: Dict[str, Deque[float]] = {}
+        
+        # One pooled session for every alert channel, so alert storms reuse
+        # connections instead of paying a TCP+TLS handshake per alert
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=10,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def _load_config(self, config_path: str) -> Mapping[str, AlertConfig]:
+        """
+        Load alert configuration from file.
+        
+        Each object-valued entry is parsed into an AlertConfig keyed by alert
+        type, once, so lookups on the alerting path are plain attribute reads.
+        """
         with open(config_path, 'r') as f:
-            return json.load(f)
+            raw = json.load(f)
+        
+        self.slack_webhook_url = raw.get("slack_webhook_url")
+        return MappingProxyType({
+            alert_type: AlertConfig(**{"type": alert_type, **entry})
+            for alert_type, entry in raw.items()
+            if isinstance(entry, dict)
+        })
 
     def should_alert(
         self,
         alert_type: str,
         value: float,
-        timestamp: Optional[datetime] = None
+        timestamp: Optional[float] = None
     ) -> bool:
-        """Check if an alert should be triggered."""
-        if alert_type not in self.config:
+        """
+        Check if an alert should be triggered.
+        
+        timestamp is in time.monotonic() seconds and defaults to now.
+        """
+        config = self.config.get(alert_type)
+        if config is None:
             return False
 
-        config = self.config[alert_type]
-        timestamp = timestamp or datetime.utcnow()
+        timestamp = time.monotonic() if timestamp is None else timestamp
         
         # Clean old history
-        self._clean_history(alert_type, timestamp)
+        self._clean_history(alert_type, timestamp, config.window)
         
         # Check threshold
-        if value >= config.threshold:
-            self.alert_history.setdefault(alert_type, []).append(timestamp)
-            return len(self.alert_history[alert_type]) >= config.threshold
+        if value >= config.value_threshold:
+            history = self.alert_history.setdefault(alert_type, deque())
+            history.append(timestamp)
+            return len(history) >= config.count_threshold
             
         return False
 
     def _clean_history(
         self,
         alert_type: str,
-        current_time: datetime
+        current_time: float,
+        window: int
     ) -> None:
         """Clean old alerts from history."""
-        if alert_type not in self.alert_history:
+        history = self.alert_history.get(alert_type)
+        if not history:
             return
 
-        window = timedelta(seconds=self.config[alert_type].window)
-        self.alert_history[alert_type] = [
-            t for t in self.alert_history[alert_type]
-            if current_time - t <= window
-        ]
+        # Entries are appended in time order, so expired ones are at the left
+        while history and current_time - history[0] > window:
+            history.popleft()
 
     def send_alert(
         self,
@@ -81,11 +116,10 @@ class AlertManager:
         details: Dict[str, Any]
     ) -> None:
         """Send alert through configured channels."""
-        if alert_type not in self.config:
+        config = self.config.get(alert_type)
+        if config is None:
             return
 
-        config = self.config[alert_type]
-        
         for channel in config.channels:
             try:
                 self._send_to_channel(
@@ -96,7 +130,9 @@ class AlertManager:
                 )
             except Exception as e:
                 logger.error(
-                    f"Failed to send alert to {channel}: {str(e)}",
+                    "Failed to send alert to %s: %s",
+                    channel,
+                    e,
                     exc_info=True
                 )
 
@@ -122,7 +158,7 @@ class AlertManager:
         details: Dict[str, Any]
     ) -> None:
         """Send alert to Slack."""
-        webhook_url = self.config.get("slack_webhook_url")
+        webhook_url = self.slack_webhook_url
         if not webhook_url:
             return
 
@@ -137,5 +173,5 @@ class AlertManager:
             }]
         }
 
-        response = requests.post(webhook_url, json=message)
+        response = self._session.post(webhook_url, json=message, timeout=2)
         response.raise_for_status() 
\ No newline at end of file
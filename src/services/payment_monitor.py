@@ -5,24 +5,32 @@ This module handles monitoring of XRPL transactions and processes
 incoming payments for merchants.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from pathlib import Path
 import threading
-from queue import Queue
-import time
+from collections import deque, OrderedDict
 
-from xrpl.clients import JsonRpcClient
-from xrpl.models.requests import AccountTx
-from xrpl.models.response import Response
+from xrpl.asyncio.clients import AsyncWebsocketClient, XRPLRequestFailureException
+from xrpl.models.requests import AccountTx, Subscribe
 
-from core.exceptions import XRPLError, DatabaseError
-from core.error_handlers import with_retry, error_context
+from core.exceptions import DatabaseError
+from core.error_handlers import error_context
 from core.metrics import metrics_collector
 from core.monitoring import AlertManager
 
 logger = logging.getLogger(__name__)
 
+# rippled API version for monitor requests; v1 keeps the transaction under
+# 'transaction' (stream) and 'tx' (account_tx), with its hash inside it
+XRPL_API_VERSION = 1
+# Most transactions handled per processor wake-up
+MAX_BATCH_SIZE = 64
+# Recently processed hashes kept for skipping backfill/stream duplicates
+PROCESSED_HASH_LIMIT = 10000
+
 class PaymentMonitor:
     """Service for monitoring XRPL payments."""
     
@@ -30,20 +38,49 @@ class PaymentMonitor:
         self,
         merchant_address: str,
         alert_manager: AlertManager,
-        max_queue_size: int = 1000
+        node_url: str = "wss://s.altnet.rippletest.net:51233",
+        max_queue_size: int = 1000,
+        state_path: Optional[Path] = None
     ):
         self.merchant_address = merchant_address
         self.alert_manager = alert_manager
-        self.client = JsonRpcClient("wss://s.altnet.rippletest.net:51233")
-        self.transaction_queue: Queue = Queue(maxsize=max_queue_size)
+        self.node_url = node_url
+        
+        # Highest ledger whose payments have all been processed; only the
+        # processing thread advances it, and reconnects backfill after it
+        self.state_path = state_path or Path('data/monitor_ledger')
+        self._last_ledger: int = -1
+        # Highest ledger the monitor loop has fully read, queued alongside
+        # each entry so the processor knows what a batch completes
+        self._scanned_ledger: int = -1
+        # Ceiling on the watermark once a payment was dropped or failed, so
+        # a restart fetches it again
+        self._hold_ledger: Optional[int] = None
+        self._watermark_lock = threading.Lock()
+        self._processed_hashes: OrderedDict = OrderedDict()
+        # One producer (the monitor loop) and one consumer (the processing
+        # thread), so deque's atomic append/popleft need no extra locking.
+        # Entries are (scanned ledger, message or None for watermark only)
+        self.transaction_queue: deque = deque(maxlen=max_queue_size)
+        self._has_items = threading.Event()
         self.shutdown_event = threading.Event()
         
+        # Event loop and task of the monitoring thread, for stop()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        
+        # Bumped for every processed payment so readers can invalidate caches
+        self.payment_count = 0
+        # Transactions evicted from a full queue since start
+        self.dropped_count = 0
+        
         # Initialize metrics
         self.metrics = metrics_collector
         
     def start(self) -> None:
         """Start the payment monitoring service."""
-        logger.info(f"Starting payment monitor for {self.merchant_address}")
+        logger.info("Starting payment monitor for %s", self.merchant_address)
+        self._last_ledger = self._load_last_ledger()
         
         # Start processing thread
         self.processing_thread = threading.Thread(
@@ -52,65 +89,265 @@ class PaymentMonitor:
         )
         self.processing_thread.start()
         
-        # Start monitoring thread
+        # Start monitoring thread with its own event loop, so websocket I/O
+        # never runs on the threads serving HTTP requests
         self.monitoring_thread = threading.Thread(
-            target=self._monitor_payments,
+            target=self._run_monitor_loop,
             daemon=True
         )
         self.monitoring_thread.start()
     
-    @with_retry(max_attempts=3, exceptions=(XRPLError,))
-    def _fetch_transactions(self) -> Response:
-        """Fetch transactions from XRPL."""
-        with error_context("fetch_transactions"):
-            with metrics_collector.measure_latency('xrpl_request'):
-                return self.client.request(
-                    AccountTx(account=self.merchant_address)
-                )
+    def _run_monitor_loop(self) -> None:
+        """Run the monitor coroutine on this thread's event loop."""
+        try:
+            asyncio.run(self.run_forever())
+        except asyncio.CancelledError:
+            pass
     
-    def _monitor_payments(self) -> None:
-        """Monitor XRPL for new payments."""
+    async def run_forever(self) -> None:
+        """
+        Monitor XRPL for new payments until stop() is called.
+        
+        Subscribes to the merchant account over WebSocket, so the node pushes
+        each validated transaction instead of being polled.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._monitor_task = asyncio.current_task()
+        
         while not self.shutdown_event.is_set():
             try:
-                response = self._fetch_transactions()
-                
-                for tx in response.result.get('transactions', []):
-                    if self._is_valid_payment(tx):
-                        self.transaction_queue.put(tx)
-                        
-                time.sleep(1)  # Avoid overwhelming the node
+                async with AsyncWebsocketClient(self.node_url) as client:
+                    await client.send(Subscribe(
+                        accounts=[self.merchant_address],
+                        api_version=XRPL_API_VERSION
+                    ))
+                    self._scanned_ledger = self._last_ledger
+                    # Subscribed first, so nothing validated during the
+                    # backfill falls between it and the stream
+                    if self._last_ledger >= 0:
+                        await self._backfill(client)
+                    
+                    async for message in client:
+                        if (message.get('type') != 'transaction'
+                                or not message.get('validated')):
+                            continue
+                        # More of this ledger's transactions may follow
+                        ledger = message['ledger_index'] - 1
+                        if self._is_valid_payment(message['transaction']):
+                            self._scanned_ledger = max(self._scanned_ledger, ledger)
+                            self._enqueue(message)
+                        elif ledger > self._scanned_ledger:
+                            self._scanned_ledger = ledger
+                            self._enqueue(None)
                 
             except Exception as e:
                 logger.error("Error monitoring payments", exc_info=True)
-                self.alert_manager.send_alert(
+                # Alert delivery does network I/O; keep it off the loop
+                self._loop.run_in_executor(
+                    None,
+                    self.alert_manager.send_alert,
                     "payment_monitor_error",
                     {"error": str(e)}
                 )
-                time.sleep(5)  # Back off on error
+                # Back off on error, waking early on shutdown
+                await asyncio.to_thread(self.shutdown_event.wait, 5)
+    
+    async def _backfill(self, client: AsyncWebsocketClient) -> None:
+        """
+        Queue payments validated after the watermark, oldest first.
+        
+        Only ledgers newer than the watermark are requested, so a reconnect
+        costs the transactions it missed rather than the account's history.
+        
+        Raises:
+            XRPLRequestFailureException: If the node rejects the request
+        """
+        # Paging with a marker requires repeating the original ledger range
+        ledger_index_min = self._last_ledger + 1
+        marker = None
+        while True:
+            response = await client.request(AccountTx(
+                account=self.merchant_address,
+                ledger_index_min=ledger_index_min,
+                ledger_index_max=-1,
+                forward=True,
+                limit=200,
+                marker=marker,
+                api_version=XRPL_API_VERSION
+            ))
+            if not response.is_successful():
+                raise XRPLRequestFailureException(response.result)
+            
+            entries = response.result['transactions']
+            for entry in self._filter_payments(entries):
+                tx = entry['tx']
+                # Same shape as a subscription stream message
+                self._enqueue({
+                    'type': 'transaction',
+                    'validated': True,
+                    'ledger_index': tx['ledger_index'],
+                    'transaction': tx,
+                    'meta': entry.get('meta')
+                })
+            
+            marker = response.result.get('marker')
+            if marker:
+                # forward=True pages are oldest first, and the next page may
+                # hold the rest of this page's last ledger
+                if entries:
+                    scanned = entries[-1]['tx']['ledger_index'] - 1
+                else:
+                    scanned = self._scanned_ledger
+            else:
+                scanned = response.result.get('ledger_index_max', self._scanned_ledger)
+            if scanned > self._scanned_ledger:
+                self._scanned_ledger = scanned
+                self._enqueue(None)
+            if not marker:
+                return
+    
+    def _enqueue(self, message: Optional[Dict[str, Any]]) -> None:
+        """
+        Queue a payment for processing without ever blocking the monitor loop.
+        
+        A full queue evicts its oldest entry so ingestion keeps pace with the
+        ledger; an evicted payment holds back the watermark, every eviction
+        is counted and repeated evictions alert. A None message only carries
+        the scanned ledger to the processor.
+        """
+        queue = self.transaction_queue
+        if len(queue) == queue.maxlen:
+            try:
+                evicted = queue[0][1]
+            except IndexError:
+                # Drained by the processor meanwhile
+                evicted = None
+            if evicted is not None:
+                self._hold_watermark(evicted['ledger_index'] - 1)
+            self.dropped_count += 1
+            self.metrics.increment_error_counter('queue_overflow', 'payment_monitor')
+            if self.alert_manager.should_alert('transaction_queue_overflow', 1):
+                # Alert delivery does network I/O; keep it off the loop
+                self._loop.run_in_executor(
+                    None,
+                    self.alert_manager.send_alert,
+                    'transaction_queue_overflow',
+                    {'dropped_count': self.dropped_count, 'queue_size': queue.maxlen}
+                )
+        queue.append((self._scanned_ledger, message))
+        self._has_items.set()
+    
+    def _hold_watermark(self, ledger: int) -> None:
+        """Keep the watermark at or below ledger until the next restart."""
+        with self._watermark_lock:
+            if self._hold_ledger is None or ledger < self._hold_ledger:
+                self._hold_ledger = ledger
+    
+    def _commit_watermark(self, ledger: int) -> None:
+        """Advance and persist the watermark once ledger is fully processed."""
+        with self._watermark_lock:
+            if self._hold_ledger is not None:
+                ledger = min(ledger, self._hold_ledger)
+            if ledger <= self._last_ledger:
+                return
+            self._last_ledger = ledger
+        self._save_last_ledger()
+    
+    def _load_last_ledger(self) -> int:
+        """Read the persisted ledger watermark, or -1 if there is none."""
+        try:
+            return int(self.state_path.read_text())
+        except FileNotFoundError:
+            return -1
+        except ValueError:
+            logger.warning("Ignoring malformed ledger state in %s", self.state_path)
+            return -1
+    
+    def _save_last_ledger(self) -> None:
+        """Persist the ledger watermark so a restart resumes from it."""
+        if self._last_ledger < 0:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(str(self._last_ledger))
     
     def _process_transactions(self) -> None:
-        """Process queued transactions."""
+        """Process queued transactions, draining up to MAX_BATCH_SIZE per wake-up."""
+        queue = self.transaction_queue
         while not self.shutdown_event.is_set():
-            try:
-                tx = self.transaction_queue.get(timeout=1)
-                self._process_transaction(tx)
-                self.transaction_queue.task_done()
-                
-            except Queue.Empty:
+            batch = []
+            while len(batch) < MAX_BATCH_SIZE:
+                try:
+                    batch.append(queue.popleft())
+                except IndexError:
+                    break
+            
+            if not batch:
+                self._has_items.wait(timeout=1)
+                self._has_items.clear()
                 continue
+            
+            payments = self._unprocessed_payments(batch)
+            try:
+                if payments:
+                    self._process_batch(payments)
             except Exception as e:
-                logger.error("Error processing transaction", exc_info=True)
+                logger.error(
+                    "Error processing batch of %d transactions", len(payments), exc_info=True
+                )
+                self._hold_watermark(min(p['ledger_index'] for p in payments) - 1)
                 self.alert_manager.send_alert(
                     "transaction_processing_error",
-                    {"error": str(e)}
+                    {"error": str(e), "batch_size": len(payments)}
                 )
+                continue
+            
+            self._remember_processed(payments)
+            self._commit_watermark(max(scanned for scanned, _ in batch))
     
-    def _process_transaction(self, transaction: Dict[str, Any]) -> None:
-        """Process a single transaction."""
+    def _unprocessed_payments(
+        self,
+        batch: List[Tuple[int, Optional[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """Drop watermark-only entries and payments already processed."""
+        payments = []
+        seen = set()
+        for _, message in batch:
+            if message is None:
+                continue
+            tx_hash = message['transaction'].get('hash')
+            if tx_hash is not None:
+                # Backfill and stream both deliver a reconnect's overlap
+                if tx_hash in self._processed_hashes or tx_hash in seen:
+                    continue
+                seen.add(tx_hash)
+            payments.append(message)
+        return payments
+    
+    def _remember_processed(self, payments: List[Dict[str, Any]]) -> None:
+        """Record processed hashes, forgetting the oldest past the limit."""
+        processed = self._processed_hashes
+        for message in payments:
+            tx_hash = message['transaction'].get('hash')
+            if tx_hash is not None:
+                processed[tx_hash] = None
+        while len(processed) > PROCESSED_HASH_LIMIT:
+            processed.popitem(last=False)
+    
+    def _process_batch(self, transactions: List[Dict[str, Any]]) -> None:
+        """Process a batch of transactions under one error and timing scope."""
         with error_context("process_transaction"):
-            with metrics_collector.measure_latency('transaction_processing'):
-                # Process payment logic here
-                pass
+            with metrics_collector.timer('transaction_processing_time'):
+                for transaction in transactions:
+                    # Process payment logic here
+                    pass
+            self.payment_count += len(transactions)
+    
+    def _filter_payments(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Select validated payments to the merchant from AccountTx entries."""
+        return [
+            entry for entry in entries
+            if entry.get('validated') and self._is_valid_payment(entry['tx'])
+        ]
     
     def _is_valid_payment(self, transaction: Dict[str, Any]) -> bool:
         """Validate if transaction is a valid payment."""
@@ -123,5 +360,10 @@ class PaymentMonitor:
         """Stop the payment monitoring service."""
         logger.info("Stopping payment monitor")
         self.shutdown_event.set()
+        # The monitor may be parked waiting on the websocket; cancel it
+        if self._loop is not None and self._monitor_task is not None:
+            self._loop.call_soon_threadsafe(self._monitor_task.cancel)
         self.monitoring_thread.join()
+        # The processing thread persists the watermark after each batch, so
+        # nothing still queued is recorded as handled
         self.processing_thread.join() 
\ No newline at end of file
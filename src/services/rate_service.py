@@ -6,11 +6,12 @@ for XRP to fiat currency conversion.
 """
 
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+import time
 import threading
+from concurrent.futures import Future
 import requests
-from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
 
 from core.exceptions import APIError
 from core.error_handlers import with_retry, error_context
@@ -18,6 +19,8 @@ from core.metrics import metrics_collector
 
 logger = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT = 5  # seconds
+
 class RateService:
     """Service for managing exchange rates."""
     
@@ -29,10 +32,22 @@ class RateService:
     ):
         self.api_key = api_key
         self.base_url = "https://pro-api.coinmarketcap.com/v1"
-        self.cache = TTLCache(maxsize=100, ttl=cache_ttl)
+        # XRP_<currency> -> (monotonic expiry, rate); read without locking
+        self.cache: Dict[str, Tuple[float, float]] = {}
+        self.cache_ttl = cache_ttl
         self.update_interval = update_interval
         self.lock = threading.Lock()
+        # Currency -> Future of the fetch already in flight for it
+        self._inflight: Dict[str, Future] = {}
         self.shutdown_event = threading.Event()
+        # Currencies requested so far; the updater refreshes them together
+        self.tracked_currencies = {"USD"}
+        
+        # Pooled session so each fetch reuses an open TLS connection;
+        # retries are handled by with_retry, not urllib3
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+        self.session.mount("https://", adapter)
         
         # Initialize metrics
         self.metrics = metrics_collector
@@ -62,47 +77,159 @@ class RateService:
             APIError: If rate fetch fails
         """
         with error_context("get_rate"):
-            with self.lock:
-                cache_key = f"XRP_{fiat_currency}"
-                
-                if cache_key in self.cache:
-                    return self.cache[cache_key]
-                
-                rate = self._fetch_rate(fiat_currency)
-                self.cache[cache_key] = rate
-                return rate
+            return self._get_cached_rates([fiat_currency])[fiat_currency]
+    
+    @with_retry(max_attempts=3, exceptions=(APIError,))
+    def get_rates(
+        self,
+        fiat_currencies: List[str]
+    ) -> Dict[str, float]:
+        """
+        Get current XRP exchange rates for several fiat currencies.
+        
+        Currencies missing from the cache are fetched in a single API call.
+        
+        Args:
+            fiat_currencies: Target fiat currency codes
+            
+        Returns:
+            Mapping of currency code to exchange rate
+            
+        Raises:
+            APIError: If rate fetch fails
+        """
+        with error_context("get_rates"):
+            return self._get_cached_rates(fiat_currencies)
+    
+    def _get_cached_rates(self, fiat_currencies: List[str]) -> Dict[str, float]:
+        """Serve rates from the cache, fetching any misses in one request."""
+        rates = {}
+        missing = []
+        now = time.monotonic()
+        for fiat_currency in fiat_currencies:
+            # Single dict.get is atomic, so hits never take a lock
+            entry = self.cache.get(f"XRP_{fiat_currency}")
+            if entry is not None and entry[0] > now:
+                rates[fiat_currency] = entry[1]
+            else:
+                missing.append(fiat_currency)
+        
+        if rates:
+            self.metrics.record_cache_lookup('rates', 'hit', len(rates))
+        if missing:
+            self.metrics.record_cache_lookup('rates', 'miss', len(missing))
+            rates.update(self._fetch_missing(missing))
+        return rates
+    
+    def _fetch_missing(self, fiat_currencies: List[str]) -> Dict[str, float]:
+        """
+        Fetch cache misses, sharing fetches already in flight.
+        
+        Only the first concurrent caller for a currency hits the API; the
+        others wait on its Future.
+        """
+        owned: Dict[str, Future] = {}
+        waiting: Dict[str, Future] = {}
+        with self.lock:
+            for fiat_currency in fiat_currencies:
+                future = self._inflight.get(fiat_currency)
+                if future is None:
+                    future = self._inflight[fiat_currency] = owned[fiat_currency] = Future()
+                else:
+                    waiting[fiat_currency] = future
+        
+        rates = {}
+        if owned:
+            try:
+                fetched = self._fetch_rates(list(owned))
+                self._store_rates(fetched)
+            except Exception as e:
+                for future in owned.values():
+                    future.set_exception(e)
+                raise
+            finally:
+                with self.lock:
+                    for fiat_currency in owned:
+                        del self._inflight[fiat_currency]
+            for fiat_currency, future in owned.items():
+                future.set_result(fetched[fiat_currency])
+            rates.update(fetched)
+        
+        for fiat_currency, future in waiting.items():
+            rates[fiat_currency] = future.result()
+        return rates
+    
+    def _store_rates(self, rates: Dict[str, float]) -> None:
+        """Write fetched rates to the cache and track their currencies."""
+        expiry = time.monotonic() + self.cache_ttl
+        for fiat_currency, rate in rates.items():
+            # Replace whole entries so readers never see a partial update
+            self.cache[f"XRP_{fiat_currency}"] = (expiry, rate)
+        with self.lock:
+            self.tracked_currencies.update(rates)
+    
+    def _refresh_all(self) -> None:
+        """Refresh every tracked currency in a single API request."""
+        with self.lock:
+            currencies = sorted(self.tracked_currencies)
+        self._store_rates(self._fetch_rates(currencies))
     
     def _fetch_rate(self, fiat_currency: str) -> float:
         """Fetch current rate from API."""
-        with metrics_collector.measure_latency('rate_api_request'):
+        return self._fetch_rates([fiat_currency])[fiat_currency]
+    
+    def _fetch_rates(self, fiat_currencies: List[str]) -> Dict[str, float]:
+        """Fetch current rates for several currencies in one API request."""
+        with metrics_collector.timer('api_latency', endpoint='coinmarketcap'):
             try:
-                response = requests.get(
+                response = self.session.get(
                     f"{self.base_url}/cryptocurrency/quotes/latest",
                     params={
                         "symbol": "XRP",
-                        "convert": fiat_currency
+                        "convert": ",".join(fiat_currencies)
                     },
                     headers={
                         "X-CMC_PRO_API_KEY": self.api_key,
                         "Accept": "application/json"
-                    }
+                    },
+                    timeout=REQUEST_TIMEOUT
                 )
                 response.raise_for_status()
                 
-                data = response.json()
-                return float(
-                    data["data"]["XRP"]["quote"][fiat_currency]["price"]
-                )
+                quote = response.json()["data"]["XRP"]["quote"]
+                return {
+                    fiat_currency: float(quote[fiat_currency]["price"])
+                    for fiat_currency in fiat_currencies
+                }
                 
+            except requests.HTTPError as e:
+                status = e.response.status_code
+                logger.error("Failed to fetch rate: %s", e, exc_info=True)
+                # Client errors other than rate limiting won't pass on retry
+                raise APIError(
+                    f"Rate fetch failed: {str(e)}",
+                    details={"currency": ",".join(fiat_currencies), "status": status},
+                    retryable=status == 429 or status >= 500
+                )
             except Exception as e:
-                logger.error(f"Failed to fetch rate: {str(e)}", exc_info=True)
+                logger.error("Failed to fetch rate: %s", e, exc_info=True)
                 raise APIError(
                     f"Rate fetch failed: {str(e)}",
-                    details={"currency": fiat_currency}
+                    details={"currency": ",".join(fiat_currencies)}
                 )
     
     def _update_rates(self) -> None:
         """Background task to update rates."""
-        while not self.shutdown_event.is_set():
+        # wait() returns True as soon as stop() is called, ending the loop
+        while not self.shutdown_event.wait(self.update_interval):
             try:
-                self.get_rate("USD") 
\ No newline at end of file
+                self._refresh_all()
+            except Exception as e:
+                logger.error("Background rate update failed: %s", e)
+    
+    def stop(self) -> None:
+        """Stop the background updater and close pooled connections."""
+        logger.info("Stopping rate service")
+        self.shutdown_event.set()
+        self.update_thread.join()
+        self.session.close()
@@ -6,11 +6,19 @@ for merchant XRPL accounts.
 """
 
 import os
+import base64
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from pathlib import Path
 import json
+import sqlite3
+import functools
+import threading
+from cachetools import TTLCache
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from xrpl.wallet import Wallet, generate_faucet_wallet
 from xrpl.clients import JsonRpcClient
 
@@ -21,24 +29,81 @@ from core.monitoring import AlertManager
 
 logger = logging.getLogger(__name__)
 
+SCHEMA_SQL = '''
+    CREATE TABLE IF NOT EXISTS wallets (
+        merchant_id TEXT PRIMARY KEY,
+        blob BLOB NOT NULL
+    )
+'''
+SAVE_WALLET_SQL = "INSERT OR REPLACE INTO wallets (merchant_id, blob) VALUES (?, ?)"
+LOAD_WALLET_SQL = "SELECT blob FROM wallets WHERE merchant_id = ?"
+
+# Blob layout: version byte || 12-byte nonce || AES-GCM ciphertext and tag,
+# with the merchant id as associated data so a blob only opens for its row.
+# Fernet tokens are base64 text, so they never start with this byte.
+WALLET_BLOB_V2 = b'\x02'
+NONCE_SIZE = 12
+
+# json.dumps builds a new encoder per call when given options; reuse one
+_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+@functools.lru_cache(maxsize=16)
+def _get_cipher(key: bytes) -> Fernet:
+    """Return the Fernet cipher for key, shared across WalletService instances."""
+    return Fernet(key)
+
+@functools.lru_cache(maxsize=16)
+def _get_aead(key: bytes) -> AESGCM:
+    """Return the AES-GCM cipher derived from a Fernet-format master key."""
+    derived = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=b'wallet-v2'
+    ).derive(base64.urlsafe_b64decode(key))
+    return AESGCM(derived)
+
 class WalletService:
     """Service for managing XRPL wallets."""
     
     def __init__(
         self,
-        encryption_key: Optional[str] = None,
+        encryption_key: Optional[Union[str, bytes]] = None,
         storage_path: Optional[Path] = None
     ):
         self.storage_path = storage_path or Path('data/wallets')
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
+        # Encrypted blobs live in one SQLite file; older per-merchant
+        # .encrypted files are imported on first load
+        self.db_path = self.storage_path / 'wallets.db'
+        self._local = threading.local()
+        self._connection().execute(SCHEMA_SQL)
+        
         # Initialize encryption
         self.encryption_key = encryption_key or os.getenv('WALLET_ENCRYPTION_KEY')
         if not self.encryption_key:
             self.encryption_key = Fernet.generate_key().decode()
             logger.warning("Generated new wallet encryption key")
         
-        self.cipher_suite = Fernet(self.encryption_key.encode())
+        key_bytes = (
+            self.encryption_key.encode()
+            if isinstance(self.encryption_key, str) else
+            self.encryption_key
+        )
+        # Fernet only decrypts wallets saved before the AES-GCM format
+        self.cipher_suite = _get_cipher(key_bytes)
+        self._aead = _get_aead(key_bytes)
+        
+        # Decrypted wallets by merchant_id, so hot lookups skip disk and Fernet
+        self._wallet_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+        self._cache_lock = threading.Lock()
+        
+        # One client per network, keyed by testnet flag
+        self._clients = {
+            False: JsonRpcClient("https://s1.ripple.com:51234"),
+            True: JsonRpcClient("https://s.altnet.rippletest.net:51234")
+        }
         
         # Initialize metrics
         self.metrics = metrics_collector
@@ -63,14 +128,10 @@ class WalletService:
             XRPLError: If wallet creation fails
         """
         with error_context("create_wallet"):
-            with metrics_collector.measure_latency('wallet_creation'):
+            with metrics_collector.timer('wallet_creation_time'):
                 try:
                     # Create wallet
-                    client = JsonRpcClient(
-                        "https://s.altnet.rippletest.net:51234"
-                        if testnet else
-                        "https://s1.ripple.com:51234"
-                    )
+                    client = self._clients[testnet]
                     
                     wallet = generate_faucet_wallet(client) if testnet else Wallet.create()
                     
@@ -95,7 +156,7 @@ class WalletService:
                     }
                     
                 except Exception as e:
-                    logger.error(f"Failed to create wallet: {str(e)}", exc_info=True)
+                    logger.error("Failed to create wallet: %s", e, exc_info=True)
                     raise XRPLError(
                         f"Wallet creation failed: {str(e)}",
                         details={"merchant_id": merchant_id}
@@ -121,39 +182,83 @@ class WalletService:
         """
         with error_context("get_wallet"):
             try:
-                wallet_data = self._load_wallet(merchant_id)
-                
-                if not include_private:
-                    wallet_data.pop("private_key", None)
-                
-                return wallet_data
+                return self._load_wallet(merchant_id, include_private)
                 
             except Exception as e:
-                logger.error(f"Failed to get wallet: {str(e)}", exc_info=True)
+                logger.error("Failed to get wallet: %s", e, exc_info=True)
                 raise XRPLError(
                     f"Wallet access failed: {str(e)}",
                     details={"merchant_id": merchant_id}
                 )
     
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection to the wallet database."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit: each save is a single statement
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn = conn
+        return conn
+    
     def _save_wallet(
         self,
         merchant_id: str,
         wallet_data: Dict[str, Any]
     ) -> None:
         """Encrypt and save wallet data."""
-        wallet_path = self.storage_path / f"{merchant_id}.encrypted"
-        
-        # Encrypt wallet data
-        encrypted_data = self.cipher_suite.encrypt(
-            json.dumps(wallet_data).encode()
+        # Encrypt wallet data; compact JSON keeps the blob short
+        nonce = os.urandom(NONCE_SIZE)
+        encrypted_data = WALLET_BLOB_V2 + nonce + self._aead.encrypt(
+            nonce, _JSON_ENCODER.encode(wallet_data).encode(), merchant_id.encode()
         )
         
-        # Save to file
-        with wallet_path.open('wb') as f:
-            f.write(encrypted_data)
+        self._connection().execute(SAVE_WALLET_SQL, (merchant_id, encrypted_data))
+        
+        with self._cache_lock:
+            self._wallet_cache[merchant_id] = dict(wallet_data)
     
-    def _load_wallet(self, merchant_id: str) -> Dict[str, Any]:
-        """Load and decrypt wallet data."""
+    def _load_wallet(
+        self,
+        merchant_id: str,
+        include_private: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Load and decrypt wallet data, serving recent loads from memory.
+        
+        The cached dict is the only copy holding the private key; callers
+        get a fresh dict, without the key unless include_private is set.
+        """
+        with self._cache_lock:
+            wallet_data = self._wallet_cache.get(merchant_id)
+        if wallet_data is None:
+            wallet_data = self._read_wallet(merchant_id)
+            with self._cache_lock:
+                self._wallet_cache[merchant_id] = wallet_data
+        if include_private:
+            return dict(wallet_data)
+        return {k: v for k, v in wallet_data.items() if k != "private_key"}
+    
+    def _read_wallet(self, merchant_id: str) -> Dict[str, Any]:
+        """Read and decrypt wallet data from storage."""
+        row = self._connection().execute(LOAD_WALLET_SQL, (merchant_id,)).fetchone()
+        encrypted_data = row[0] if row else self._read_wallet_file(merchant_id)
+        
+        if encrypted_data[:1] == WALLET_BLOB_V2:
+            nonce = encrypted_data[1:1 + NONCE_SIZE]
+            return json.loads(self._aead.decrypt(
+                nonce, encrypted_data[1 + NONCE_SIZE:], merchant_id.encode()
+            ))
+        
+        # Fernet token from the previous format; re-encrypt it as AES-GCM
+        wallet_data = json.loads(self.cipher_suite.decrypt(encrypted_data))
+        self._save_wallet(merchant_id, wallet_data)
+        return wallet_data
+    
+    def _read_wallet_file(self, merchant_id: str) -> bytes:
+        """Read a wallet saved by the file-per-merchant layout."""
         wallet_path = self.storage_path / f"{merchant_id}.encrypted"
         
         if not wallet_path.exists():
@@ -161,9 +266,5 @@ class WalletService:
                 f"Wallet not found for merchant: {merchant_id}"
             )
         
-        # Load and decrypt
-        with wallet_path.open('rb') as f:
-            encrypted_data = f.read()
-            
-        decrypted_data = self.cipher_suite.decrypt(encrypted_data)
-        return json.loads(decrypted_data) 
\ No newline at end of file
+        logger.info("Importing wallet file for merchant: %s", merchant_id)
+        return wallet_path.read_bytes()
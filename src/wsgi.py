@@ -0,0 +1,17 @@
+"""
+WSGI entry point for serving fleXRP in production.
+
+Serve with a single gunicorn worker and a thread pool:
+
+    gunicorn --chdir src -w 1 -k gthread --threads 8 wsgi:application
+
+The services created by start_app() (wallet service, payment monitor, rate
+and alert HTTP sessions) are shared by all of the worker's threads, so size
+connection pools to the thread count. Use one worker because each worker
+process would start its own payment monitor and metrics server, and do not
+pass --preload: the monitor's threads do not survive the fork.
+"""
+
+from app import start_app
+
+application = start_app()
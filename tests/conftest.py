@@ -1,9 +1,4 @@
 import pytest
-import os
-import sys
-
-# Add src to Python path for imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 @pytest.fixture(scope="session")
 def test_config():
@@ -0,0 +1,119 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+import services.payment_monitor as payment_monitor
+from services.payment_monitor import PaymentMonitor, XRPL_API_VERSION
+
+MERCHANT = "rHb9CJAWyB4rj91VRWn96DkukG4bwdtyTh"
+
+class FakeResponse:
+    def __init__(self, result):
+        self.result = result
+    
+    def is_successful(self):
+        return True
+
+class FakeClient:
+    """Serves AccountTx pages in order and records the requests."""
+    
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.requests = []
+    
+    async def request(self, request):
+        self.requests.append(request)
+        return FakeResponse(self.pages.pop(0))
+
+def _payment(tx_hash, ledger_index):
+    """Build an account_tx entry in the API v1 shape the monitor requests."""
+    return {
+        "validated": True,
+        "tx": {
+            "hash": tx_hash,
+            "ledger_index": ledger_index,
+            "TransactionType": "Payment",
+            "Destination": MERCHANT,
+        },
+    }
+
+def _stream_message(entry):
+    return {
+        "type": "transaction",
+        "validated": True,
+        "ledger_index": entry["tx"]["ledger_index"],
+        "transaction": entry["tx"],
+    }
+
+@pytest.fixture
+def monitor(tmp_path):
+    monitor = PaymentMonitor(MERCHANT, mock.Mock(), state_path=tmp_path / "ledger")
+    monitor._last_ledger = monitor._scanned_ledger = 9
+    return monitor
+
+def _run_processor(monitor, until_ledger):
+    """Run the processing thread until the watermark reaches until_ledger."""
+    thread = threading.Thread(target=monitor._process_transactions)
+    thread.start()
+    try:
+        for _ in range(500):
+            if monitor._last_ledger >= until_ledger and not monitor.transaction_queue:
+                break
+            time.sleep(0.01)
+    finally:
+        monitor.shutdown_event.set()
+        monitor._has_items.set()
+        thread.join(timeout=5)
+
+@pytest.mark.asyncio
+async def test_backfill_holds_back_ledger_split_by_marker(monitor):
+    """Test a marker page only counts ledgers before its last entry"""
+    client = FakeClient([
+        {"transactions": [_payment("A", 10), _payment("B", 11)], "marker": "next"},
+        {"transactions": [_payment("C", 11)], "ledger_index_max": 20},
+    ])
+    
+    await monitor._backfill(client)
+    
+    assert [r.api_version for r in client.requests] == [XRPL_API_VERSION] * 2
+    assert [r.marker for r in client.requests] == [None, "next"]
+    assert [r.ledger_index_min for r in client.requests] == [10, 10]
+    # Ledger 11 continues on the second page, so the first stops at 10
+    assert [scanned for scanned, _ in monitor.transaction_queue] == [9, 9, 10, 10, 20]
+    # Nothing is committed until the processor has handled it
+    assert monitor._last_ledger == 9
+
+def test_watermark_commits_after_processing(monitor):
+    """Test the processor persists the watermark and skips duplicate hashes"""
+    monitor._scanned_ledger = 20
+    for entry in (_payment("A", 10), _payment("C", 11), _payment("A", 10)):
+        monitor._enqueue(_stream_message(entry))
+    
+    _run_processor(monitor, 20)
+    
+    assert monitor.payment_count == 2
+    assert monitor._last_ledger == 20
+    assert monitor.state_path.read_text() == "20"
+
+def test_failed_batch_holds_watermark(monitor, monkeypatch):
+    """Test a payment that failed processing keeps the watermark below it"""
+    monkeypatch.setattr(payment_monitor, "MAX_BATCH_SIZE", 1)
+    calls = []
+    
+    def process_batch(transactions):
+        calls.append(transactions)
+        if len(calls) == 1:
+            raise RuntimeError("processing failed")
+    
+    monitor._process_batch = process_batch
+    monitor._scanned_ledger = 20
+    monitor._enqueue(_stream_message(_payment("A", 12)))
+    monitor._enqueue(_stream_message(_payment("C", 15)))
+    
+    _run_processor(monitor, 11)
+    
+    assert len(calls) == 2
+    assert monitor._last_ledger == 11
+    assert monitor.state_path.read_text() == "11"
@@ -0,0 +1,53 @@
+import threading
+import time
+
+import pytest
+
+from services.rate_service import RateService
+
+class FakeResponse:
+    def __init__(self, prices):
+        self.prices = prices
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        quote = {c: {"price": p} for c, p in self.prices.items()}
+        return {"data": {"XRP": {"quote": quote}}}
+
+@pytest.fixture
+def rate_service():
+    service = RateService("test_key", update_interval=3600)
+    yield service
+    service.stop()
+
+def test_concurrent_misses_fetch_once(rate_service):
+    """Test concurrent cache misses share a single API request"""
+    calls = []
+    fetch_started = threading.Event()
+    release = threading.Event()
+    
+    def fake_get(url, params, **kwargs):
+        calls.append(params["convert"])
+        fetch_started.set()
+        release.wait(timeout=5)
+        return FakeResponse({"USD": 0.5, "EUR": 0.45})
+    
+    rate_service.session.get = fake_get
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(rate_service.get_rates(["USD", "EUR"])))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    assert fetch_started.wait(timeout=5)
+    # Let the other callers reach the in-flight fetch before it completes
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    
+    assert calls == ["USD,EUR"]
+    assert results == [{"USD": 0.5, "EUR": 0.45}] * 8
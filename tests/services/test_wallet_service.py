@@ -0,0 +1,44 @@
+import json
+import sqlite3
+
+import pytest
+from cryptography.fernet import Fernet
+
+from core.exceptions import XRPLError
+from services.wallet_service import WalletService, WALLET_BLOB_V2, SAVE_WALLET_SQL
+
+WALLET = {"address": "rHb9CJAWyB4rj91VRWn96DkukG4bwdtyTh", "private_key": "secret"}
+
+@pytest.fixture
+def encryption_key():
+    return Fernet.generate_key()
+
+def _stored_blob(service, merchant_id):
+    with sqlite3.connect(service.db_path) as conn:
+        return conn.execute(
+            "SELECT blob FROM wallets WHERE merchant_id = ?", (merchant_id,)
+        ).fetchone()[0]
+
+def test_fernet_wallet_is_resaved_as_v2(tmp_path, encryption_key):
+    """Test a legacy Fernet blob decrypts and is re-encrypted as AES-GCM"""
+    service = WalletService(encryption_key, tmp_path)
+    legacy = Fernet(encryption_key).encrypt(json.dumps(WALLET).encode())
+    with sqlite3.connect(service.db_path) as conn:
+        conn.execute(SAVE_WALLET_SQL, ("merchant-1", legacy))
+    
+    assert service.get_wallet("merchant-1", include_private=True) == WALLET
+    assert _stored_blob(service, "merchant-1")[:1] == WALLET_BLOB_V2
+    
+    # A fresh instance has no cache, so this reads the re-saved blob
+    reloaded = WalletService(encryption_key, tmp_path)
+    assert reloaded.get_wallet("merchant-1", include_private=True) == WALLET
+
+def test_v2_blob_only_opens_for_its_merchant(tmp_path, encryption_key):
+    """Test an AES-GCM blob copied to another merchant's row is rejected"""
+    service = WalletService(encryption_key, tmp_path)
+    service._save_wallet("merchant-1", WALLET)
+    with sqlite3.connect(service.db_path) as conn:
+        conn.execute(SAVE_WALLET_SQL, ("merchant-2", _stored_blob(service, "merchant-1")))
+    
+    with pytest.raises(XRPLError):
+        WalletService(encryption_key, tmp_path).get_wallet("merchant-2")
@@ -0,0 +1,16 @@
+import importlib
+
+import pytest
+
+@pytest.mark.parametrize('module', [
+    'core.error_handlers',
+    'core.exceptions',
+    'core.metrics',
+    'core.monitoring',
+    'services.payment_monitor',
+    'services.rate_service',
+    'services.wallet_service',
+])
+def test_importable(module):
+    """Test application modules import"""
+    importlib.import_module(module)